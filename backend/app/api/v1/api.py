@@ -1,10 +1,26 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import availability
+from app.api.v1.endpoints import availability, metrics, sessions, timezones
 
 api_router = APIRouter()
+api_router.include_router(
+    sessions.router,
+    prefix="/availability/sessions",
+    tags=["sessions"],
+    responses={404: {"description": "Not found"}}
+)
 api_router.include_router(
     availability.router,
     prefix="/availability",
     tags=["availability"],
     responses={404: {"description": "Not found"}}
-) 
\ No newline at end of file
+)
+api_router.include_router(
+    metrics.router,
+    prefix="/metrics",
+    tags=["metrics"]
+)
+api_router.include_router(
+    timezones.router,
+    prefix="/timezones",
+    tags=["timezones"]
+)
@@ -1,32 +1,396 @@
-from fastapi import APIRouter, HTTPException, Depends, Request, Header
-from app.schemas.availability import AvailabilityRequest, AvailabilityResponse
-from app.services.availability_service import AvailabilityService
+from fastapi import APIRouter, HTTPException, Depends, Request, Response, Header, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from hashlib import sha256
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+from app.schemas.availability import (
+    AvailabilityColumns,
+    AvailabilityRequest,
+    AvailabilityResponse,
+    BatchAvailabilityRequest,
+    BatchAvailabilityResponse,
+    BatchItemResult,
+    TimeSlot,
+)
+from app.services.availability_service import AvailabilityService, OutputTooLargeError
+from app.services.pagination import InvalidCursorError
+from app.services.render_pool import RenderPoolFull
+from app.services.timezone_catalog import is_known_zone
+from app.services.timezone_engine import RecipientZones, recipient_zones
 from app.core.config import settings
-import pytz
+from app.core.timing import annotate_request, stage
+from app.models.slot_array import SlotArray
+import asyncio
+import json
 from datetime import datetime
 import logging
 
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Accept types that select the compact columnar payload instead of text
+COMPACT_JSON_MEDIA_TYPE = "application/vnd.timetext.columns+json"
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+# Number of table lines sent per chunk of a streaming response
+STREAM_BATCH_LINES = 512
+
 def get_api_key(api_key: str = Header(..., alias="X-API-Key")):
     if api_key != settings.API_KEY:
         raise HTTPException(status_code=401, detail="Invalid API key")
     return api_key
 
 async def get_request_body(request: Request) -> AvailabilityRequest:
+    # Decode and validate the raw bytes in a single pydantic-core pass
+    raw = await request.body()
     try:
-        body = await request.json()
-        return AvailabilityRequest(**body)
+        with stage("parse"):
+            return AvailabilityRequest.model_validate_json(raw)
     except Exception as e:
         logger.error(f"Error parsing request body: {str(e)}")
         raise HTTPException(status_code=400, detail=f"Invalid request body: {str(e)}")
 
+async def get_batch_request_body(request: Request) -> BatchAvailabilityRequest:
+    try:
+        batch = BatchAvailabilityRequest.model_validate_json(await request.body())
+    except Exception as e:
+        logger.error(f"Error parsing batch request body: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Invalid request body: {str(e)}")
+    if len(batch.items) > settings.MAX_BATCH_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch too large. At most {settings.MAX_BATCH_ITEMS} items are allowed"
+        )
+    return batch
+
+def check_timezones(zones: Iterable[str]) -> Dict[str, str]:
+    """Validate each distinct zone once, returning an error message per invalid zone."""
+    errors = {}
+    for zone in set(zones):
+        if not is_known_zone(zone):
+            errors[zone] = f"Invalid timezone: {zone!r}"
+    return errors
+
+def request_recipient_zones(body: AvailabilityRequest) -> List[str]:
+    """Return ``recipient_timezone`` followed by ``recipient_timezones``, without repeats."""
+    zones = [body.recipient_timezone] if body.recipient_timezone else []
+    return list(dict.fromkeys(zones + body.recipient_timezones))
+
+def request_timezones(body: AvailabilityRequest) -> Iterator[str]:
+    yield body.user_timezone
+    yield from request_recipient_zones(body)
+
+def validate_render_settings(
+    user_timezone: str,
+    recipient_timezone: RecipientZones,
+    output_format: str,
+    zone_errors: Optional[Dict[str, str]] = None
+) -> None:
+    """Raise a 400 ``HTTPException`` for unknown zones or an unknown format."""
+    # Validate timezones
+    recipients = recipient_zones(recipient_timezone)
+    if len(recipients) > settings.MAX_RECIPIENT_TIMEZONES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many recipient timezones. At most {settings.MAX_RECIPIENT_TIMEZONES} are allowed"
+        )
+    zones = [user_timezone, *recipients]
+    if zone_errors is None:
+        zone_errors = check_timezones(zones)
+    for zone in zones:
+        if zone in zone_errors:
+            raise HTTPException(status_code=400, detail=zone_errors[zone])
+
+    # Validate output format
+    if output_format not in ["continuous", "chunks"]:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid output_format. Must be either 'continuous' or 'chunks'"
+        )
+
+def validate_slots(slots: List[TimeSlot]) -> SlotArray:
+    """Return the slots' UTC epoch start and end columns, rejecting empty or inverted slots."""
+    # Compared as epoch seconds, so naive and offset-aware slots can be mixed
+    epochs = AvailabilityService.slot_epochs(slots)
+    if any(start >= end for start, end in zip(*epochs)):
+        raise HTTPException(
+            status_code=400,
+            detail="Start time must be before end time for each slot"
+        )
+    return epochs
+
+def validate_availability_request(
+    body: AvailabilityRequest,
+    zone_errors: Optional[Dict[str, str]] = None
+) -> SlotArray:
+    """Raise a 400 ``HTTPException`` if ``body`` cannot be rendered.
+
+    Returns the normalized intervals, so slots are decoded only once.
+    """
+    validate_render_settings(
+        body.user_timezone, request_recipient_zones(body), body.output_format, zone_errors
+    )
+    if body.response_format not in ["text", "columns"]:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid response_format. Must be either 'text' or 'columns'"
+        )
+    return AvailabilityService.merge_intervals(validate_slots(body.selected_slots))
+
+async def render_availability(
+    body: AvailabilityRequest,
+    threaded: bool = False,
+    intervals: Optional[SlotArray] = None
+) -> AvailabilityResponse:
+    if body.response_format == "columns":
+        return render_columns(body, intervals)
+    try:
+        text_output = await AvailabilityService.generate_output_async(
+            body.selected_slots,
+            body.user_timezone,
+            request_recipient_zones(body),
+            body.output_format,
+            body.slot_granularity_minutes,
+            threaded=threaded,
+            intervals=intervals
+        )
+    except OutputTooLargeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RenderPoolFull:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many large renders in progress. Please retry shortly"
+        )
+    return AvailabilityResponse(
+        text_output=text_output,
+        user_timezone=body.user_timezone,
+        recipient_timezone=body.recipient_timezone,
+        recipient_timezones=request_recipient_zones(body)
+    )
+
+def render_columns(
+    body: AvailabilityRequest,
+    intervals: Optional[SlotArray] = None
+) -> AvailabilityResponse:
+    starts, ends = intervals or AvailabilityService.normalize_slots(body.selected_slots)
+    try:
+        columns = AvailabilityService.generate_columns(
+            starts,
+            ends,
+            body.user_timezone,
+            request_recipient_zones(body),
+            body.output_format,
+            body.slot_granularity_minutes
+        )
+    except OutputTooLargeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return AvailabilityResponse(
+        columns=AvailabilityColumns(**columns),
+        user_timezone=body.user_timezone,
+        recipient_timezone=body.recipient_timezone,
+        recipient_timezones=request_recipient_zones(body)
+    )
+
+def paginate_availability(
+    body: AvailabilityRequest,
+    limit: Optional[int],
+    cursor: Optional[str]
+) -> AvailabilityResponse:
+    if body.output_format != "chunks":
+        raise HTTPException(
+            status_code=400,
+            detail="Pagination is only supported for 'chunks' output"
+        )
+    if limit is None:
+        limit = settings.MAX_OUTPUT_ROWS
+    if not 1 <= limit <= settings.MAX_OUTPUT_ROWS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid limit. Must be between 1 and {settings.MAX_OUTPUT_ROWS}"
+        )
+    try:
+        text_output, next_cursor = AvailabilityService.generate_chunks_page(
+            body.selected_slots,
+            body.user_timezone,
+            request_recipient_zones(body),
+            body.slot_granularity_minutes,
+            limit,
+            cursor
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return AvailabilityResponse(
+        text_output=text_output,
+        user_timezone=body.user_timezone,
+        recipient_timezone=body.recipient_timezone,
+        recipient_timezones=request_recipient_zones(body),
+        next_cursor=next_cursor
+    )
+
+def make_etag(fingerprint: str, *variant) -> str:
+    """Return a strong ETag for a request fingerprint and response variant."""
+    digest = sha256(fingerprint.encode())
+    for part in variant:
+        digest.update(f"|{part}".encode())
+    return f'"{digest.hexdigest()[:32]}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Return whether ``If-None-Match`` names ``etag`` or is ``*``.
+
+    The resource always has a current representation, so ``*`` matches.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        # If-None-Match uses weak comparison, so W/ prefixes are ignored
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+def conditional_response(request: Request, etag: str, headers: Dict[str, str]) -> Optional[Response]:
+    """Return the response to a request whose ``If-None-Match`` matches ``etag``.
+
+    As RFC 9110 requires, GET and HEAD get ``304 Not Modified`` and any
+    other method ``412 Precondition Failed``. Returns None when it does not
+    match.
+    """
+    if not etag_matches(request, etag):
+        return None
+    if request.method in ("GET", "HEAD"):
+        return Response(status_code=304, headers=headers)
+    return Response(status_code=412, headers={"ETag": etag})
+
+def cache_headers(etag: str) -> Dict[str, str]:
+    # Responses belong to the API key that requested them, so shared caches
+    # must not store them
+    return {
+        "ETag": etag,
+        "Cache-Control": f"private, max-age={settings.CACHE_MAX_AGE}",
+        "Vary": "Accept, X-API-Key",
+    }
+
+def compact_media_type(request: Request) -> Optional[str]:
+    """Return the compact media type ``Accept`` prefers, or None for JSON or text.
+
+    Every representation the server can produce is ranked by its q-value, with
+    JSON winning ties; MessagePack is offered only when msgpack is installed.
+    Raises a 406 ``HTTPException`` when ``Accept`` rules all of them out.
+    """
+    accept = request.headers.get("accept")
+    if not accept:
+        return None
+    offered = ["application/json", "text/plain", COMPACT_JSON_MEDIA_TYPE]
+    if msgpack is not None:
+        offered.extend(MSGPACK_MEDIA_TYPES)
+    qualities = {media_type: accept_quality(accept, media_type) for media_type in offered}
+    # max() keeps the first of equal candidates, so JSON wins ties
+    best = max(offered, key=qualities.__getitem__)
+    if qualities[best] <= 0:
+        raise HTTPException(
+            status_code=406,
+            detail=f"None of the available representations is acceptable: {', '.join(offered)}"
+        )
+    return None if best in ("application/json", "text/plain") else best
+
+def compact_response(
+    body: AvailabilityRequest,
+    intervals: SlotArray,
+    media_type: str,
+    headers: Dict[str, str]
+) -> Response:
+    try:
+        with stage("render"):
+            payload = AvailabilityService.build_compact_output(
+                *intervals,
+                body.user_timezone,
+                request_recipient_zones(body),
+                body.output_format,
+                body.slot_granularity_minutes
+            )
+    except OutputTooLargeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    with stage("serialize"):
+        if media_type == COMPACT_JSON_MEDIA_TYPE:
+            content = json.dumps(payload, separators=(",", ":"))
+        else:
+            content = msgpack.packb(payload)
+    return Response(content=content, media_type=media_type, headers=headers)
+
+def json_response(model: BaseModel, headers: Dict[str, str]) -> Response:
+    """Serialize ``model`` in one pydantic-core pass, timed as the serialize stage."""
+    with stage("serialize"):
+        content = model.model_dump_json()
+    return Response(content=content, media_type="application/json", headers=headers)
+
+def accept_quality(accept: str, media_type: str) -> float:
+    """Return the q-value ``accept`` gives ``media_type``, 0 if it is not acceptable.
+
+    The most specific matching range wins, so ``text/plain;q=0.1, */*``
+    gives ``text/plain`` a q of 0.1.
+    """
+    main_type = media_type.split("/", 1)[0]
+    best_specificity, quality = -1, 0.0
+    for item in accept.split(","):
+        media_range, *params = item.split(";")
+        media_range = media_range.strip().lower()
+        if media_range == media_type:
+            specificity = 2
+        elif media_range == f"{main_type}/*":
+            specificity = 1
+        elif media_range == "*/*":
+            specificity = 0
+        else:
+            continue
+        if specificity <= best_specificity:
+            continue
+        best_specificity, quality = specificity, 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+    return quality
+
+def wants_stream(request: Request, stream: bool) -> bool:
+    """Stream on ``?stream=true``, or when ``Accept`` prefers text/plain over JSON.
+
+    Clients that list both at the same q, like the common
+    ``application/json, text/plain, */*``, keep receiving JSON.
+    """
+    if stream:
+        return True
+    accept = request.headers.get("accept", "")
+    return accept_quality(accept, "text/plain") > accept_quality(accept, "application/json")
+
+def stream_lines(lines: Iterator[str]) -> Iterator[str]:
+    """Join lines into newline-separated batches, matching ``text_output``."""
+    separator = ""
+    with stage("render"):
+        batch = list(islice(lines, STREAM_BATCH_LINES))
+    while batch:
+        yield separator + "\n".join(batch)
+        separator = "\n"
+        with stage("render"):
+            batch = list(islice(lines, STREAM_BATCH_LINES))
+
 @router.post("/", response_model=AvailabilityResponse)
 async def generate_availability_text(
     request: Request,
     body: AvailabilityRequest = Depends(get_request_body),
-    api_key: str = Depends(get_api_key)
+    api_key: str = Depends(get_api_key),
+    stream: bool = Query(False, description="Stream the table as plain text"),
+    limit: Optional[int] = Query(None, description="Page size for chunks output"),
+    cursor: Optional[str] = Query(None, description="Cursor returned by the previous page")
 ):
     """
     Generate formatted text output for selected availability slots.
@@ -34,58 +398,95 @@ async def generate_availability_text(
     - **selected_slots**: List of time slots with start and end times
     - **user_timezone**: User's timezone in IANA format (e.g., 'America/New_York')
     - **recipient_timezone**: Optional recipient's timezone in IANA format
+    - **recipient_timezones**: Optional further recipient timezones, one column each
     - **output_format**: Either 'continuous' or 'chunks'
     - **slot_granularity_minutes**: Minutes per slot (used if output_format is 'chunks')
+    - **response_format**: Either 'text' for `text_output` or 'columns' for parallel arrays in `columns`
+
+    Pass `?stream=true`, or an `Accept` header that ranks `text/plain` above
+    `application/json` (e.g. `Accept: text/plain`), to receive the table as a
+    streamed `text/plain` body instead of JSON.
+
+    Machine clients can send `Accept: application/vnd.timetext.columns+json`
+    (or `application/msgpack` when msgpack is installed) to receive compact
+    columns of epoch seconds and zone offsets instead of text.
+
+    For chunks output, pass `limit` to receive one page of rows and follow
+    `next_cursor` with `?cursor=...` until it is null.
+
+    Responses carry an `ETag`. Since this is a POST, repeating the request
+    with a matching `If-None-Match` (or `*`) returns `412 Precondition Failed`
+    without rendering.
     """
     try:
-        logger.info(f"Received request: {await request.json()}")
+        logger.info(
+            "Received request: %d slots, %s -> %s, format=%s",
+            len(body.selected_slots),
+            body.user_timezone,
+            request_recipient_zones(body),
+            body.output_format
+        )
         
-        # Validate timezones
-        try:
-            pytz.timezone(body.user_timezone)
-            if body.recipient_timezone:
-                pytz.timezone(body.recipient_timezone)
-        except pytz.exceptions.UnknownTimeZoneError as e:
+        with stage("validate"):
+            intervals = validate_availability_request(body)
+        compact_type = compact_media_type(request)
+        text_response = compact_type is None and body.response_format == "text"
+        streaming = text_response and wants_stream(request, stream)
+        if not text_response and (limit is not None or cursor is not None):
             raise HTTPException(
                 status_code=400,
-                detail=f"Invalid timezone: {str(e)}"
+                detail="Pagination is only supported for text output"
             )
-
-        # Validate output format
-        if body.output_format not in ["continuous", "chunks"]:
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid output_format. Must be either 'continuous' or 'chunks'"
+        etag = make_etag(
+            AvailabilityService.fingerprint(
+                *intervals,
+                body.user_timezone,
+                request_recipient_zones(body),
+                body.output_format,
+                body.slot_granularity_minutes
+            ),
+            compact_type or ("text" if streaming else f"json-{body.response_format}"),
+            limit,
+            cursor
+        )
+        headers = cache_headers(etag)
+        conditional = conditional_response(request, etag, headers)
+        if conditional is not None:
+            return conditional
+        annotate_request(
+            body.output_format,
+            AvailabilityService.count_rows(
+                *intervals, body.output_format, body.slot_granularity_minutes
             )
+        )
 
-        # Validate time slots
-        for slot in body.selected_slots:
-            if slot.start >= slot.end:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Start time must be before end time for each slot"
-                )
+        if compact_type:
+            return compact_response(body, intervals, compact_type, headers)
 
-        # Generate output based on format
-        if body.output_format == "continuous":
-            text_output = AvailabilityService.generate_continuous_output(
-                body.selected_slots,
-                body.user_timezone,
-                body.recipient_timezone
-            )
-        else:  # chunks
-            text_output = AvailabilityService.generate_chunks_output(
-                body.selected_slots,
-                body.user_timezone,
-                body.recipient_timezone,
-                body.slot_granularity_minutes
+        if limit is not None or cursor is not None:
+            with stage("render"):
+                page = paginate_availability(body, limit, cursor)
+            return json_response(page, headers)
+
+        if streaming:
+            try:
+                lines = AvailabilityService.iter_output(
+                    body.selected_slots,
+                    body.user_timezone,
+                    request_recipient_zones(body),
+                    body.output_format,
+                    body.slot_granularity_minutes,
+                    intervals=intervals
+                )
+            except OutputTooLargeError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            return StreamingResponse(
+                stream_lines(lines), media_type="text/plain", headers=headers
             )
 
-        return AvailabilityResponse(
-            text_output=text_output,
-            user_timezone=body.user_timezone,
-            recipient_timezone=body.recipient_timezone
-        )
+        with stage("render"):
+            result = await render_availability(body, intervals=intervals)
+        return json_response(result, headers)
     except HTTPException:
         raise
     except Exception as e:
@@ -93,4 +494,83 @@ async def generate_availability_text(
         raise HTTPException(
             status_code=500,
             detail=f"An error occurred: {str(e)}"
-        ) 
\ No newline at end of file
+        )
+
+def validate_batch_item(
+    item: AvailabilityRequest,
+    zone_errors: Dict[str, str]
+) -> Union[SlotArray, BatchItemResult]:
+    """Return the item's normalized intervals, or the error result to report for it."""
+    try:
+        return validate_availability_request(item, zone_errors)
+    except HTTPException as e:
+        return BatchItemResult(error=e.detail)
+    except Exception as e:
+        logger.error(f"Error validating batch item: {str(e)}")
+        return BatchItemResult(error=f"An error occurred: {str(e)}")
+
+def batch_row_count(
+    items: List[AvailabilityRequest],
+    validated: List[Union[SlotArray, BatchItemResult]]
+) -> int:
+    """Return the rows the batch would render, leaving out items that will fail."""
+    total = 0
+    for item, intervals in zip(items, validated):
+        if isinstance(intervals, BatchItemResult):
+            continue
+        rows = AvailabilityService.count_rows(
+            *intervals, item.output_format, item.slot_granularity_minutes
+        )
+        # Items over the per-request limit are reported as errors, not rendered
+        if rows <= settings.MAX_OUTPUT_ROWS:
+            total += rows
+    return total
+
+async def render_batch_item(
+    item: AvailabilityRequest,
+    intervals: Union[SlotArray, BatchItemResult]
+) -> BatchItemResult:
+    if isinstance(intervals, BatchItemResult):
+        return intervals
+    try:
+        return BatchItemResult(
+            result=await render_availability(item, threaded=True, intervals=intervals)
+        )
+    except HTTPException as e:
+        return BatchItemResult(error=e.detail)
+    except Exception as e:
+        logger.error(f"Error processing batch item: {str(e)}")
+        return BatchItemResult(error=f"An error occurred: {str(e)}")
+
+@router.post("/batch", response_model=BatchAvailabilityResponse)
+async def generate_availability_batch(
+    body: BatchAvailabilityRequest = Depends(get_batch_request_body),
+    api_key: str = Depends(get_api_key)
+):
+    """
+    Generate formatted text output for many availability requests at once.
+
+    - **items**: List of availability requests, each shaped like the body of `POST /availability/`
+
+    Items are rendered concurrently; `results` holds one entry per item, in
+    order, with either a `result` or an `error`. A batch whose items would
+    render more than `MAX_BATCH_ROWS` rows in total is rejected with 400.
+    """
+    logger.info("Received batch request: %d items", len(body.items))
+    zone_errors = check_timezones(
+        zone for item in body.items for zone in request_timezones(item)
+    )
+    validated = [validate_batch_item(item, zone_errors) for item in body.items]
+    total_rows = batch_row_count(body.items, validated)
+    if total_rows > settings.MAX_BATCH_ROWS:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Batch output too large: {total_rows} rows across all items exceeds "
+                f"the limit of {settings.MAX_BATCH_ROWS}"
+            )
+        )
+    results = await asyncio.gather(
+        *(render_batch_item(item, intervals) for item, intervals in zip(body.items, validated))
+    )
+    return BatchAvailabilityResponse(results=results)
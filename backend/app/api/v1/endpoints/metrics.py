@@ -0,0 +1,68 @@
+from typing import List
+from fastapi import APIRouter
+from app.core.timing import metric_family, register_collector
+from app.services.availability_service import block_cache, render_cache, render_pool
+from app.services.session_store import session_store
+
+router = APIRouter()
+
+def collect_service_metrics() -> List[str]:
+    """Return the render pool, cache and session counters for ``GET /metrics``."""
+    pool = render_pool.stats()
+    caches = {"render": render_cache.stats(), "block": block_cache.stats()}
+    sessions = session_store.stats()
+    lines = []
+    for key, description in (
+        ("busy_workers", "Render pool workers running a render."),
+        ("queue_depth", "Renders waiting for a free render pool worker."),
+        ("max_workers", "Render pool size."),
+        ("utilization", "Fraction of render pool workers that are busy."),
+    ):
+        lines += metric_family(f"timetext_render_pool_{key}", description, "gauge", [({}, pool[key])])
+    lines += metric_family(
+        "timetext_render_pool_tasks_total",
+        "Renders submitted to, completed by and rejected by the render pool.",
+        "counter",
+        [({"outcome": outcome}, pool[outcome]) for outcome in ("submitted", "completed", "rejected")],
+    )
+    for key, kind, description in (
+        ("size", "gauge", "Entries held by each render cache."),
+        ("weight", "gauge", "Total weight of each render cache: characters or cells."),
+        ("hits", "counter", "Render cache lookups that found an entry."),
+        ("misses", "counter", "Render cache lookups that found nothing."),
+        ("evictions", "counter", "Entries dropped to keep each render cache within bounds."),
+    ):
+        name = f"timetext_cache_{key}" + ("_total" if kind == "counter" else "")
+        lines += metric_family(
+            name, description, kind,
+            [({"cache": cache}, stats[key]) for cache, stats in caches.items()],
+        )
+    lines += metric_family(
+        "timetext_sessions", "Live availability sessions.", "gauge", [({}, sessions["size"])]
+    )
+    lines += metric_family(
+        "timetext_session_evictions_total",
+        "Sessions dropped for inactivity or to stay within MAX_SESSIONS.",
+        "counter",
+        [({}, sessions["evictions"])],
+    )
+    return lines
+
+register_collector(collect_service_metrics)
+
+@router.get("/")
+async def get_metrics():
+    """
+    Report render pool and render cache counters.
+
+    - **render_pool**: queue depth, busy workers, utilization and task counts
+    - **render_cache** / **block_cache**: size, total weight (characters or
+      cells), hits, misses and evictions
+    - **sessions**: live availability sessions and evictions
+    """
+    return {
+        "render_pool": render_pool.stats(),
+        "render_cache": render_cache.stats(),
+        "block_cache": block_cache.stats(),
+        "sessions": session_store.stats(),
+    }
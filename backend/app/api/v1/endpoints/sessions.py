@@ -0,0 +1,141 @@
+import asyncio
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from app.api.v1.endpoints.availability import (
+    get_api_key,
+    get_request_body,
+    validate_render_settings,
+    validate_slots,
+)
+from app.schemas.availability import AvailabilityRequest, SessionPatchRequest, SessionResponse
+from app.core.config import settings
+from app.services.availability_service import AvailabilityService, OutputTooLargeError
+from app.services.session_store import AvailabilitySession, session_store
+import logging
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+async def get_patch_body(request: Request) -> SessionPatchRequest:
+    try:
+        return SessionPatchRequest.model_validate_json(await request.body())
+    except Exception as e:
+        logger.error(f"Error parsing session patch body: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Invalid request body: {str(e)}")
+
+def get_session(session_id: str) -> AvailabilitySession:
+    session = session_store.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+    return session
+
+async def render_session(session: AvailabilitySession) -> SessionResponse:
+    try:
+        if session.row_count() >= settings.OFFLOAD_ROW_THRESHOLD:
+            # A thread rather than render_pool: the session's date blocks are
+            # cached in this process
+            text_output = await asyncio.to_thread(session.render)
+        else:
+            text_output = session.render()
+    except OutputTooLargeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return SessionResponse(
+        session_id=session.session_id,
+        text_output=text_output,
+        user_timezone=session.user_timezone,
+        recipient_timezone=session.recipient_timezone,
+        output_format=session.output_format,
+        slot_granularity_minutes=session.slot_granularity_minutes
+    )
+
+@router.post("/", response_model=SessionResponse, status_code=201)
+async def create_session(
+    body: AvailabilityRequest = Depends(get_request_body),
+    api_key: str = Depends(get_api_key)
+):
+    """
+    Create an availability session from a full availability request.
+
+    The session keeps the merged slots and the rendered rows of each date, so
+    later edits only re-render the dates they touch. Sessions render a text
+    table for at most one recipient, so ``recipient_timezones`` and a
+    ``response_format`` other than "text" are rejected.
+    """
+    if body.recipient_timezones:
+        raise HTTPException(
+            status_code=400,
+            detail="Sessions support a single recipient_timezone; recipient_timezones is not supported"
+        )
+    if body.response_format != "text":
+        raise HTTPException(
+            status_code=400,
+            detail="Sessions only support response_format 'text'"
+        )
+    validate_render_settings(body.user_timezone, body.recipient_timezone, body.output_format)
+    intervals = AvailabilityService.merge_intervals(validate_slots(body.selected_slots))
+    # Checked before the session is stored, so rejected requests take no slot
+    try:
+        AvailabilityService.check_row_count(
+            *intervals, body.output_format, body.slot_granularity_minutes
+        )
+    except OutputTooLargeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    session = session_store.create(
+        user_timezone=body.user_timezone,
+        recipient_timezone=body.recipient_timezone,
+        output_format=body.output_format,
+        slot_granularity_minutes=body.slot_granularity_minutes,
+        intervals=intervals
+    )
+    logger.info("Created session with %d intervals", len(session.starts))
+    return await render_session(session)
+
+@router.patch("/{session_id}", response_model=SessionResponse)
+async def update_session(
+    session_id: str,
+    body: SessionPatchRequest = Depends(get_patch_body),
+    api_key: str = Depends(get_api_key)
+):
+    """
+    Apply slot deltas and setting changes to a session.
+
+    - **add_slots** / **remove_slots**: slots to add or remove; removals are applied first
+    - **user_timezone**, **recipient_timezone**, **output_format**, **slot_granularity_minutes**: optional new settings
+
+    A patch whose result would exceed the row limit is rejected with 400 and
+    leaves the session unchanged.
+    """
+    session = get_session(session_id)
+    changes = {
+        name: getattr(body, name)
+        for name in (
+            "user_timezone", "recipient_timezone", "output_format", "slot_granularity_minutes"
+        )
+        if name in body.model_fields_set
+        and (getattr(body, name) is not None or name == "recipient_timezone")
+    }
+    validate_render_settings(
+        changes.get("user_timezone", session.user_timezone),
+        changes.get("recipient_timezone", session.recipient_timezone),
+        changes.get("output_format", session.output_format)
+    )
+    validate_slots(body.add_slots)
+    validate_slots(body.remove_slots)
+
+    try:
+        session.update(add_slots=body.add_slots, remove_slots=body.remove_slots, **changes)
+    except OutputTooLargeError as e:
+        # The session is left as it was
+        raise HTTPException(status_code=400, detail=str(e))
+    return await render_session(session)
+
+@router.get("/{session_id}", response_model=SessionResponse)
+async def read_session(session_id: str, api_key: str = Depends(get_api_key)):
+    """Return the rendered availability of a session."""
+    return await render_session(get_session(session_id))
+
+@router.delete("/{session_id}", status_code=204)
+async def delete_session(session_id: str, api_key: str = Depends(get_api_key)):
+    """Discard a session."""
+    if not session_store.delete(session_id):
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+    return Response(status_code=204)
@@ -0,0 +1,30 @@
+import time
+from fastapi import APIRouter, Request, Response
+from app.api.v1.endpoints.availability import conditional_response
+from app.core.config import settings
+from app.services.timezone_catalog import timezone_catalog
+
+router = APIRouter()
+
+@router.get("/")
+async def get_timezones(request: Request):
+    """
+    List the IANA timezones accepted by the availability endpoints.
+
+    - **zones**: canonical zone names with their current UTC offset in seconds,
+      abbreviation (e.g. "PDT") and aliases
+    - **aliases**: every alias mapped to its canonical zone
+    - **valid_until**: UTC epoch second of the next offset change in any zone
+
+    Supports ``If-None-Match`` with the returned ``ETag``.
+    """
+    now = int(time.time())
+    catalog = timezone_catalog.get(now)
+    headers = {
+        "ETag": catalog.etag,
+        "Cache-Control": f"public, max-age={catalog.max_age(now, settings.CACHE_MAX_AGE)}",
+    }
+    response = conditional_response(request, catalog.etag, headers)
+    if response is not None:
+        return response
+    return Response(content=catalog.body, media_type="application/json", headers=headers)
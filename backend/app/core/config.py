@@ -4,6 +4,39 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     API_KEY: str = os.getenv("API_KEY", "your-default-api-key-here")
     DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
+    # Number of rendered tables kept in the LRU render cache (0 disables it)
+    RENDER_CACHE_SIZE: int = int(os.getenv("RENDER_CACHE_SIZE", "256"))
+    # Total characters of rendered text the render cache may hold; larger tables are not cached
+    RENDER_CACHE_MAX_BYTES: int = int(os.getenv("RENDER_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    # Number of per-date column blocks kept for reuse across renders (0 disables it)
+    BLOCK_CACHE_SIZE: int = int(os.getenv("BLOCK_CACHE_SIZE", "4096"))
+    # Total table cells the block cache may hold; larger blocks are not cached
+    BLOCK_CACHE_MAX_CELLS: int = int(os.getenv("BLOCK_CACHE_MAX_CELLS", "500000"))
+    # Timezone conversion backend: "table" (precomputed), "pytz" or "zoneinfo"
+    TIMEZONE_BACKEND: str = os.getenv("TIMEZONE_BACKEND", "table")
+    # Maximum number of recipient timezone columns in one request
+    MAX_RECIPIENT_TIMEZONES: int = int(os.getenv("MAX_RECIPIENT_TIMEZONES", "10"))
+    # Maximum number of items accepted by the batch endpoint
+    MAX_BATCH_ITEMS: int = int(os.getenv("MAX_BATCH_ITEMS", "100"))
+    # Requests that would render more rows than this are rejected
+    MAX_OUTPUT_ROWS: int = int(os.getenv("MAX_OUTPUT_ROWS", "50000"))
+    # Batches whose items would render more rows than this in total are rejected
+    MAX_BATCH_ROWS: int = int(os.getenv("MAX_BATCH_ROWS", "100000"))
+    # Outputs with at least this many rows are rendered in the render pool
+    OFFLOAD_ROW_THRESHOLD: int = int(os.getenv("OFFLOAD_ROW_THRESHOLD", "20000"))
+    # Render pool: "process" or "thread", worker count and maximum pending renders
+    RENDER_POOL_KIND: str = os.getenv("RENDER_POOL_KIND", "process")
+    RENDER_POOL_WORKERS: int = int(os.getenv("RENDER_POOL_WORKERS", "2"))
+    RENDER_POOL_MAX_PENDING: int = int(os.getenv("RENDER_POOL_MAX_PENDING", "32"))
+    # Availability sessions kept in memory and seconds of inactivity before expiry
+    MAX_SESSIONS: int = int(os.getenv("MAX_SESSIONS", "1000"))
+    SESSION_IDLE_SECONDS: int = int(os.getenv("SESSION_IDLE_SECONDS", "1800"))
+    # Seconds clients and shared caches may reuse an availability response
+    CACHE_MAX_AGE: int = int(os.getenv("CACHE_MAX_AGE", "300"))
+    # Responses smaller than this many bytes are sent uncompressed
+    COMPRESSION_MINIMUM_SIZE: int = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+    # Directory for collapsed-stack profiles of "X-Profile: 1" requests (DEBUG only)
+    PROFILE_DIR: str = os.getenv("PROFILE_DIR", "profiles")
 
     class Config:
         env_file = ".env"
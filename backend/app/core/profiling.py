@@ -0,0 +1,158 @@
+"""Opt-in per-request profiling for debug deployments.
+
+With ``settings.DEBUG`` on, a request carrying ``X-Profile: 1`` runs under a
+deterministic stack profiler. Time is attributed to full call stacks, and
+the result is written to ``settings.PROFILE_DIR`` in the collapsed-stack
+format read by flamegraph.pl and speedscope. The response names the file in
+``X-Profile-File`` and carries a ``Server-Timing`` header with the stage
+durations from ``app.core.timing``.
+
+Only the request's own task is profiled, up to the start of the response, so
+the body of a streamed response is not in the profile.
+"""
+import asyncio
+from collections import defaultdict
+from pathlib import Path
+import secrets
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+from app.core.timing import current_timing
+
+
+def _frame_label(code) -> str:
+    return f"{getattr(code, 'co_qualname', code.co_name)} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class StackProfiler:
+    """Deterministic profiler that times every distinct call stack of one task.
+
+    Uses ``sys.setprofile``, so only the thread that calls ``start`` is
+    profiled; work handed to other threads or processes shows up as time
+    spent waiting for it. When started inside an asyncio task, events from
+    other tasks on the same event loop are ignored and the time they take is
+    not counted.
+    """
+
+    def __init__(self):
+        self._stack: List[str] = []
+        self._totals: Dict[Tuple[str, ...], float] = defaultdict(float)
+        self._task: Optional[asyncio.Task] = None
+        # None while another task is running
+        self._last: Optional[float] = 0.0
+
+    def _callback(self, frame, event: str, arg) -> None:
+        now = time.perf_counter()
+        if self._task is not None and asyncio.current_task() is not self._task:
+            if self._last is not None and self._stack:
+                self._totals[tuple(self._stack)] += now - self._last
+            self._last = None
+            return
+        if self._last is not None and self._stack:
+            self._totals[tuple(self._stack)] += now - self._last
+        if event == "call":
+            self._stack.append(_frame_label(frame.f_code))
+        elif event == "c_call":
+            self._stack.append(f"{getattr(arg, '__qualname__', arg)} (builtin)")
+        elif self._stack:
+            # return, c_return and c_exception; frames entered before start()
+            # return with an empty stack and are ignored
+            self._stack.pop()
+        self._last = time.perf_counter()
+
+    def start(self) -> None:
+        try:
+            self._task = asyncio.current_task()
+        except RuntimeError:  # no running event loop
+            self._task = None
+        self._last = time.perf_counter()
+        sys.setprofile(self._callback)
+
+    def stop(self) -> None:
+        sys.setprofile(None)
+
+    def collapsed(self) -> str:
+        """Return one "outer;inner;leaf microseconds" line per call stack."""
+        lines = [
+            f"{';'.join(stack)} {round(seconds * 1_000_000)}"
+            for stack, seconds in sorted(self._totals.items())
+            if seconds >= 0.0000005
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def server_timing(stages: Dict[str, float], total: float) -> str:
+    """Format stage durations in seconds as a ``Server-Timing`` header value."""
+    metrics = [f"{name};dur={seconds * 1000:.3f}" for name, seconds in stages.items()]
+    metrics.append(f"total;dur={total * 1000:.3f}")
+    return ", ".join(metrics)
+
+
+class ProfilingMiddleware:
+    """Profile requests sent with ``X-Profile: 1`` while ``settings.DEBUG`` is on.
+
+    Must sit inside ``TimingMiddleware`` to report stage durations. One
+    request is profiled at a time. Other requests run normally meanwhile and
+    are left out of its profile, though ``Server-Timing``'s total is wall
+    time and includes any time they held the event loop.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._busy = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not settings.DEBUG
+            or self._busy
+            or Headers(scope=scope).get("x-profile") != "1"
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        self._busy = True
+        profiler = StackProfiler()
+        started = time.perf_counter()
+        stopped = False
+
+        def finish() -> Optional[str]:
+            nonlocal stopped
+            if stopped:
+                return None
+            stopped = True
+            profiler.stop()
+            self._busy = False
+            return self._write(profiler)
+
+        async def send_profiled(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # The handler is done once the response starts
+                elapsed = time.perf_counter() - started
+                path = finish()
+                headers = MutableHeaders(scope=message)
+                timing = current_timing()
+                headers["Server-Timing"] = server_timing(
+                    timing.stages if timing is not None else {}, elapsed
+                )
+                if path is not None:
+                    headers["X-Profile-File"] = path
+            await send(message)
+
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_profiled)
+        finally:
+            finish()
+
+    @staticmethod
+    def _write(profiler: StackProfiler) -> str:
+        directory = Path(settings.PROFILE_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        name = f"{time.strftime('%Y%m%dT%H%M%S')}-{secrets.token_hex(4)}.collapsed"
+        path = directory / name
+        path.write_text(profiler.collapsed())
+        return str(path)
@@ -0,0 +1,227 @@
+"""Per-stage request timing exported as Prometheus histograms.
+
+``TimingMiddleware`` attaches a ``RequestTiming`` to each HTTP request
+through a context variable. Code on the hot path wraps its work in
+``stage(name)`` blocks, which add their elapsed time to the current request
+and cost one context variable lookup when no request is being timed. Stages
+do not overlap: while a nested stage runs, the enclosing one is paused, so a
+request's stage durations add up to at most its total.
+Endpoints call ``annotate_request`` with the output format and row count;
+only annotated requests are recorded, once the response has been sent.
+Other modules add their own gauges and counters to ``render_metrics`` with
+``register_collector``.
+"""
+from bisect import bisect_left
+from contextvars import ContextVar
+from threading import Lock
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Upper bounds, in seconds, of the duration histogram buckets
+DURATION_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+# Upper bounds of the row-count label values
+ROW_BUCKETS = (10, 100, 1_000, 10_000)
+
+
+def row_bucket(rows: int) -> str:
+    """Return the row-count label for ``rows``, e.g. "<=100"."""
+    idx = bisect_left(ROW_BUCKETS, rows)
+    return f"<={ROW_BUCKETS[idx]}" if idx < len(ROW_BUCKETS) else f">{ROW_BUCKETS[-1]}"
+
+
+class Histogram:
+    """Cumulative Prometheus histogram keyed by a tuple of label values."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str],
+        buckets: Sequence[float] = DURATION_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # Per label set: per-bucket counts (plus +Inf), sum of observations
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+        self._lock = Lock()
+
+    def observe(self, value: float, labels: Tuple[str, ...]) -> None:
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][idx] += 1
+            series[1][0] += value
+
+    def count(self, labels: Tuple[str, ...]) -> int:
+        with self._lock:
+            series = self._series.get(labels)
+            return sum(series[0]) if series else 0
+
+    def render(self) -> List[str]:
+        """Return the histogram in the Prometheus text exposition format."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((labels, list(counts), total[0]) for labels, (counts, total) in self._series.items())
+        for labels, counts, total in series:
+            label_text = ",".join(
+                f'{name}="{value}"' for name, value in zip(self.label_names, labels)
+            )
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{self.name}_bucket{{{label_text},le="{le}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {total!r}")
+            lines.append(f"{self.name}_count{{{label_text}}} {cumulative}")
+        return lines
+
+
+def metric_family(
+    name: str,
+    documentation: str,
+    kind: str,
+    samples: Iterable[Tuple[Mapping[str, str], float]]
+) -> List[str]:
+    """Return one gauge or counter with its labeled samples in the text format."""
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        label_text = ",".join(f'{label}="{label_value}"' for label, label_value in labels.items())
+        lines.append(f"{name}{{{label_text}}} {value!r}" if label_text else f"{name} {value!r}")
+    return lines
+
+
+_collectors: List[Callable[[], List[str]]] = []
+
+
+def register_collector(collect: Callable[[], List[str]]) -> None:
+    """Add ``collect``'s exposition lines to every ``render_metrics`` call."""
+    _collectors.append(collect)
+
+
+request_duration = Histogram(
+    "timetext_request_duration_seconds",
+    "Time from receiving an availability request to sending the last byte.",
+    ("output_format", "rows"),
+)
+stage_duration = Histogram(
+    "timetext_stage_duration_seconds",
+    "Time spent in each stage of an availability request.",
+    ("stage", "output_format", "rows"),
+)
+
+
+class RequestTiming:
+    """Stage durations and labels collected for one request."""
+
+    __slots__ = ("stages", "output_format", "rows")
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self.output_format: Optional[str] = None
+        self.rows = 0
+
+    def add(self, name: str, elapsed: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + elapsed
+
+
+_current_timing: ContextVar[Optional[RequestTiming]] = ContextVar("request_timing", default=None)
+_current_stage: ContextVar[Optional["StageTimer"]] = ContextVar("request_stage", default=None)
+
+
+class StageTimer:
+    """Context manager adding the time spent in its block to the current request.
+
+    Time spent in stages nested inside the block is left out.
+    """
+
+    __slots__ = ("name", "timing", "started", "parent", "token")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self) -> "StageTimer":
+        self.timing = _current_timing.get()
+        if self.timing is not None:
+            now = perf_counter()
+            self.parent = _current_stage.get()
+            if self.parent is not None:
+                # Pause the enclosing stage until this one exits
+                self.parent.timing.add(self.parent.name, now - self.parent.started)
+            self.token = _current_stage.set(self)
+            self.started = now
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self.timing is not None:
+            now = perf_counter()
+            self.timing.add(self.name, now - self.started)
+            _current_stage.reset(self.token)
+            if self.parent is not None:
+                self.parent.started = now
+
+
+def stage(name: str) -> StageTimer:
+    """Time a block as stage ``name`` of the current request, if it is timed."""
+    return StageTimer(name)
+
+
+def current_timing() -> Optional[RequestTiming]:
+    """Return the timing record of the request being handled, if any."""
+    return _current_timing.get()
+
+
+def annotate_request(output_format: str, rows: int) -> None:
+    """Label the current request's timings; unlabeled requests are not recorded."""
+    timing = _current_timing.get()
+    if timing is not None:
+        timing.output_format = output_format
+        timing.rows = rows
+
+
+def render_metrics() -> str:
+    """Return every histogram and registered metric in the Prometheus text format."""
+    lines = request_duration.render() + stage_duration.render()
+    for collect in _collectors:
+        lines.extend(collect())
+    return "\n".join(lines) + "\n"
+
+
+class TimingMiddleware:
+    """Record request and stage durations of annotated HTTP requests."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        timing = RequestTiming()
+        token = _current_timing.set(timing)
+        started = perf_counter()
+
+        async def send_timed(message: Message) -> None:
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                self._record(timing, perf_counter() - started)
+
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            _current_timing.reset(token)
+
+    @staticmethod
+    def _record(timing: RequestTiming, elapsed: float) -> None:
+        if timing.output_format is None:
+            return
+        labels = (timing.output_format, row_bucket(timing.rows))
+        request_duration.observe(elapsed, labels)
+        for name, seconds in timing.stages.items():
+            stage_duration.observe(seconds, (name,) + labels)
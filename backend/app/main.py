@@ -1,7 +1,15 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.api import api_router
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
+from app.core.profiling import ProfilingMiddleware
+from app.core.timing import TimingMiddleware, render_metrics
+from app.services.availability_service import render_pool
+from app.services.timezone_backends import get_zone_converter
+from app.services.timezone_catalog import timezone_catalog
 import logging
 
 # Configure logging
@@ -10,11 +18,21 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the timezone catalog, and every zone's table with it, before serving
+    timezone_catalog.get()
+    # Fail at startup rather than per request on an unknown TIMEZONE_BACKEND
+    get_zone_converter("UTC")
+    yield
+    render_pool.shutdown()
+
 app = FastAPI(
     title="Availability Calendar API",
     description="API for managing and converting availability time slots",
     version="1.0.0",
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -30,6 +48,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large responses with brotli when available, otherwise gzip
+app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+
+# Profile "X-Profile: 1" requests when DEBUG is on; inside the timing
+# middleware so it can report stage durations
+app.add_middleware(ProfilingMiddleware)
+
+# Outermost, so request durations include compression
+app.add_middleware(TimingMiddleware)
+
 # Include API router
 app.include_router(api_router, prefix="/api/v1")
 
@@ -39,4 +67,9 @@ async def root():
         "message": "Welcome to the Availability Calendar API",
         "version": "1.0.0",
         "docs_url": "/docs",
-    } 
\ No newline at end of file
+    } 
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Request and per-stage duration histograms in the Prometheus text format."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
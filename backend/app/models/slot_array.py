@@ -0,0 +1,46 @@
+"""Compact column storage for availability intervals."""
+from array import array
+from typing import NamedTuple, Tuple
+import numpy as np
+
+
+class SlotArray(NamedTuple):
+    """Parallel ``array('q')`` columns of UTC epoch start and end seconds.
+
+    Holds 16 bytes per slot, against several hundred for a ``TimeSlot`` and
+    its two datetimes. Unpacks as ``starts, ends``.
+    """
+
+    starts: array
+    ends: array
+
+    @classmethod
+    def empty(cls) -> "SlotArray":
+        return cls(array("q"), array("q"))
+
+    @classmethod
+    def from_numpy(cls, starts: np.ndarray, ends: np.ndarray) -> "SlotArray":
+        result = cls.empty()
+        result.starts.frombytes(np.ascontiguousarray(starts, dtype=np.int64).tobytes())
+        result.ends.frombytes(np.ascontiguousarray(ends, dtype=np.int64).tobytes())
+        return result
+
+    @property
+    def size(self) -> int:
+        """Number of slots."""
+        return len(self.starts)
+
+    def as_numpy(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return int64 views of the columns without copying."""
+        return (
+            np.frombuffer(self.starts, dtype=np.int64),
+            np.frombuffer(self.ends, dtype=np.int64),
+        )
+
+    def take(self, index: np.ndarray) -> "SlotArray":
+        """Return the slots at ``index``, in that order."""
+        starts, ends = self.as_numpy()
+        return SlotArray.from_numpy(starts[index], ends[index])
+
+    def concat(self, other: "SlotArray") -> "SlotArray":
+        return SlotArray(self.starts + other.starts, self.ends + other.ends)
@@ -1,33 +1,90 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, List, Optional
 from pydantic import BaseModel, Field, field_validator
 
 class TimeSlot(BaseModel):
-    start: str = Field(..., description="Start time of the availability slot in ISO format")
-    end: str = Field(..., description="End time of the availability slot in ISO format")
+    # Parsed natively by pydantic-core; naive times are read as UTC
+    start: datetime = Field(..., description="Start time of the availability slot in ISO format")
+    end: datetime = Field(..., description="End time of the availability slot in ISO format")
 
-    @field_validator('start', 'end')
+    @field_validator("start", "end", mode="before")
     @classmethod
-    def validate_datetime(cls, v: str) -> datetime:
-        try:
-            return datetime.fromisoformat(v)
-        except ValueError:
-            raise ValueError("Invalid datetime format. Must be in ISO format.")
+    def require_iso_string(cls, value: Any) -> Any:
+        """Reject numbers and numeric strings, which pydantic reads as Unix timestamps."""
+        if isinstance(value, datetime):
+            return value
+        if not isinstance(value, str) or value.strip().lstrip("+-").replace(".", "", 1).isdigit():
+            raise ValueError("must be an ISO 8601 datetime string")
+        return value
 
 class AvailabilityRequest(BaseModel):
     selected_slots: List[TimeSlot] = Field(..., description="List of selected time slots")
     user_timezone: str = Field(..., description="User's timezone (IANA format)")
     recipient_timezone: Optional[str] = Field(None, description="Recipient's timezone (IANA format)")
+    recipient_timezones: List[str] = Field(
+        default_factory=list,
+        description="More recipients' timezones (IANA format); each adds a column after recipient_timezone"
+    )
     output_format: str = Field(
         default="continuous",
         description="Format of output: 'continuous' or 'chunks'"
     )
     slot_granularity_minutes: int = Field(
         default=30,
+        ge=1,
+        le=24 * 60,
         description="Granularity of time slots in minutes (used if output_format is 'chunks')"
     )
+    response_format: str = Field(
+        default="text",
+        description="Shape of the response: 'text' for text_output or 'columns' for parallel arrays"
+    )
+
+class RecipientColumns(BaseModel):
+    timezone: str = Field(..., description="Recipient's timezone")
+    start: List[int] = Field(..., description="Row start as wall-clock seconds since the epoch in this timezone")
+    end: List[int] = Field(..., description="Row end as wall-clock seconds since the epoch in this timezone")
+
+class AvailabilityColumns(BaseModel):
+    date: List[str] = Field(..., description="Date label of each row in the user's timezone")
+    utc_start: List[int] = Field(..., description="Row start as UTC epoch seconds")
+    utc_end: List[int] = Field(..., description="Row end as UTC epoch seconds")
+    user_start: List[int] = Field(..., description="Row start as wall-clock seconds since the epoch in the user's timezone")
+    user_end: List[int] = Field(..., description="Row end as wall-clock seconds since the epoch in the user's timezone")
+    recipient_start: Optional[List[int]] = Field(None, description="Row start as wall-clock seconds since the epoch in the first recipient's timezone")
+    recipient_end: Optional[List[int]] = Field(None, description="Row end as wall-clock seconds since the epoch in the first recipient's timezone")
+    recipients: Optional[List[RecipientColumns]] = Field(None, description="Start and end columns of every recipient timezone, in column order")
 
 class AvailabilityResponse(BaseModel):
+    text_output: Optional[str] = Field(None, description="Formatted text output of availability; null for 'columns' responses")
+    columns: Optional[AvailabilityColumns] = Field(None, description="Table rows as parallel arrays, for 'columns' responses")
+    user_timezone: str = Field(..., description="User's timezone")
+    recipient_timezone: Optional[str] = Field(None, description="Recipient's timezone")
+    recipient_timezones: List[str] = Field(default_factory=list, description="Every recipient timezone, in column order")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page of paginated chunks output")
+
+class BatchAvailabilityRequest(BaseModel):
+    items: List[AvailabilityRequest] = Field(..., description="Availability requests to render")
+
+class BatchItemResult(BaseModel):
+    result: Optional[AvailabilityResponse] = Field(None, description="Rendered output, if the item succeeded")
+    error: Optional[str] = Field(None, description="Error message, if the item failed")
+
+class BatchAvailabilityResponse(BaseModel):
+    results: List[BatchItemResult] = Field(..., description="One result per request item, in order")
+
+class SessionPatchRequest(BaseModel):
+    add_slots: List[TimeSlot] = Field(default_factory=list, description="Time slots to add")
+    remove_slots: List[TimeSlot] = Field(default_factory=list, description="Time slots to remove (applied before additions)")
+    user_timezone: Optional[str] = Field(None, description="New user's timezone (IANA format)")
+    recipient_timezone: Optional[str] = Field(None, description="New recipient's timezone; send null explicitly to clear it")
+    output_format: Optional[str] = Field(None, description="New output format: 'continuous' or 'chunks'")
+    slot_granularity_minutes: Optional[int] = Field(None, ge=1, le=24 * 60, description="New chunk granularity in minutes")
+
+class SessionResponse(BaseModel):
+    session_id: str = Field(..., description="Session identifier")
     text_output: str = Field(..., description="Formatted text output of availability")
     user_timezone: str = Field(..., description="User's timezone")
-    recipient_timezone: Optional[str] = Field(None, description="Recipient's timezone") 
\ No newline at end of file
+    recipient_timezone: Optional[str] = Field(None, description="Recipient's timezone")
+    output_format: str = Field(..., description="Format of output: 'continuous' or 'chunks'")
+    slot_granularity_minutes: int = Field(..., description="Granularity of time slots in minutes")
@@ -1,7 +1,63 @@
-from datetime import datetime, timedelta
-from typing import List, Optional
-import pytz
+from array import array
+import asyncio
+import numpy as np
+from datetime import datetime
+from itertools import chain
+from typing import Dict, Iterator, List, Optional, Tuple
+from app.core.config import settings
+from app.models.slot_array import SlotArray
 from app.schemas.availability import TimeSlot
+from app.services.chunk_engine import (
+    chunk_count,
+    chunk_counts,
+    chunk_intervals,
+    chunk_rows,
+    chunk_user_cells,
+    chunk_zone_cells,
+    total_chunk_count,
+)
+from app.services import formatting
+from app.services.formatting import date_label, date_labels, time_labels
+from app.services.pagination import decode_cursor, encode_cursor
+from app.services.render_cache import RenderCache, make_block_key, make_cache_key
+from app.services.render_pool import RenderPool
+from app.services.timezone_backends import get_zone_converter
+from app.services.timezone_engine import (
+    SECONDS_PER_DAY,
+    RecipientZones,
+    ZoneConverter,
+    recipient_zones,
+    to_epoch,
+)
+
+# Bump whenever the rendered output changes so previously issued ETags
+# stop matching
+OUTPUT_VERSION = 1
+
+# Chunks are rendered in blocks of this size so one long slot never
+# materializes all of its rows at once
+CHUNK_BLOCK_SIZE = 2048
+
+# Rendered tables are ASCII, so their length is their size in bytes
+render_cache = RenderCache(settings.RENDER_CACHE_SIZE, settings.RENDER_CACHE_MAX_BYTES)
+# Blocks are lists of cells, so their length is their cell count
+block_cache = RenderCache(settings.BLOCK_CACHE_SIZE, settings.BLOCK_CACHE_MAX_CELLS)
+render_pool = RenderPool(
+    settings.RENDER_POOL_KIND,
+    settings.RENDER_POOL_WORKERS,
+    settings.RENDER_POOL_MAX_PENDING
+)
+
+class OutputTooLargeError(ValueError):
+    """Raised when a request would render more rows than allowed."""
+
+    def __init__(self, row_count: int, max_rows: int):
+        super().__init__(
+            f"Output too large: {row_count} rows exceeds the maximum of {max_rows}. "
+            "Use a larger slot_granularity_minutes or fewer slots"
+        )
+        self.row_count = row_count
+        self.max_rows = max_rows
 
 class AvailabilityService:
     @staticmethod
@@ -10,128 +66,633 @@ class AvailabilityService:
         from_tz: str,
         to_tz: str
     ) -> datetime:
-        """Convert datetime from one timezone to another."""
-        from_zone = pytz.timezone(from_tz)
-        to_zone = pytz.timezone(to_tz)
-        
-        # If datetime is naive, localize it
+        """Convert datetime from one timezone to another.
+
+        Naive datetimes are read as wall-clock time in ``from_tz``.
+        """
         if dt.tzinfo is None:
-            dt = from_zone.localize(dt)
-        # If datetime is already localized, convert it
+            epoch = get_zone_converter(from_tz).localize(dt)
         else:
-            dt = dt.astimezone(from_zone)
-        
-        # Convert to target timezone
-        return dt.astimezone(to_zone)
+            epoch = to_epoch(dt)
+        converted = get_zone_converter(to_tz).to_datetime(epoch)
+        return converted.replace(microsecond=dt.microsecond)
 
     @staticmethod
     def format_time(dt: datetime) -> str:
         """Format datetime to a readable time string."""
-        return dt.strftime("%I:%M %p").lstrip("0")
+        return formatting.format_time(dt)
 
     @staticmethod
     def format_date(dt: datetime) -> str:
         """Format datetime to a readable date string."""
-        return dt.strftime("%a, %b %d")
+        return formatting.format_date(dt)
+
+    @staticmethod
+    def build_header(user_tz: str, recipient_tz: RecipientZones = None) -> List[str]:
+        """Build the intro line, column header and separator."""
+        output = ["Here's my availability:\n"]
+        header = f"Date        | My Timezone ({user_tz})"
+        for zone in recipient_zones(recipient_tz):
+            header += f" | Recipient's Timezone ({zone})"
+        output.append(header)
+        output.append("-" * len(header))
+        return output
+
+    @staticmethod
+    def merge_intervals(intervals: SlotArray) -> SlotArray:
+        """Sort intervals and merge any that overlap or touch.
+
+        Sorting is done through an index array, and runs of overlapping
+        intervals are found from the running maximum of their ends.
+        """
+        starts, ends = intervals.as_numpy()
+        if not len(starts):
+            return SlotArray.empty()
+        order = np.lexsort((ends, starts))
+        starts = starts[order]
+        reach = np.maximum.accumulate(ends[order])
+        # An interval opens a new run unless it starts within the reach of the previous ones
+        opens = np.flatnonzero(np.concatenate(([True], starts[1:] > reach[:-1])))
+        closes = np.append(opens[1:] - 1, len(starts) - 1)
+        return SlotArray.from_numpy(starts[opens], reach[closes])
+
+    @staticmethod
+    def slot_epochs(slots: List[TimeSlot]) -> SlotArray:
+        """Return the slots as UTC epoch start and end columns, in slot order."""
+        starts = array("q", [to_epoch(slot.start) for slot in slots])
+        ends = array("q", [to_epoch(slot.end) for slot in slots])
+        return SlotArray(starts, ends)
+
+    @staticmethod
+    def normalize_slots(slots: List[TimeSlot]) -> SlotArray:
+        """Sort slots and merge any that overlap or touch.
+
+        Returns UTC epoch start and end columns, ordered by start.
+        """
+        return AvailabilityService.merge_intervals(AvailabilityService.slot_epochs(slots))
+
+    @staticmethod
+    def subtract_intervals(
+        starts: array,
+        ends: array,
+        remove_starts: array,
+        remove_ends: array
+    ) -> SlotArray:
+        """Remove normalized intervals from normalized intervals in one sweep."""
+        result = SlotArray.empty()
+        j = 0
+        for start, end in zip(starts, ends):
+            # Skip removals that end before this interval begins
+            while j < len(remove_starts) and remove_ends[j] <= start:
+                j += 1
+            k = j
+            while k < len(remove_starts) and remove_starts[k] < end:
+                if remove_starts[k] > start:
+                    result.starts.append(start)
+                    result.ends.append(remove_starts[k])
+                start = max(start, remove_ends[k])
+                k += 1
+            if start < end:
+                result.starts.append(start)
+                result.ends.append(end)
+        return result
+
+    @staticmethod
+    def _date_order(
+        starts: array,
+        ends: array,
+        user_tz: str
+    ) -> Tuple[SlotArray, np.ndarray]:
+        # Stable sort by user-zone start date, so each date keeps start order
+        intervals = SlotArray(starts, ends)
+        days = get_zone_converter(user_tz).to_local_array(intervals.as_numpy()[0]) // SECONDS_PER_DAY
+        order = np.argsort(days, kind="stable")
+        return intervals.take(order), days[order]
+
+    @staticmethod
+    def group_by_date(
+        starts: array,
+        ends: array,
+        user_tz: str
+    ) -> Dict[int, SlotArray]:
+        """Split normalized intervals by start date in the user's timezone.
+
+        Keys are day numbers since the epoch, in ascending order; each value
+        keeps its intervals in start order.
+        """
+        ordered, days = AvailabilityService._date_order(starts, ends, user_tz)
+        keys, firsts = np.unique(days, return_index=True)
+        lasts = np.append(firsts[1:], len(days))
+        return {
+            int(day): SlotArray(ordered.starts[first:last], ordered.ends[first:last])
+            for day, first, last in zip(keys, firsts, lasts)
+        }
+
+    @staticmethod
+    def order_by_date(starts: array, ends: array, user_tz: str) -> SlotArray:
+        """Reorder normalized intervals into the row order of the rendered table."""
+        return AvailabilityService._date_order(starts, ends, user_tz)[0]
+
+    @staticmethod
+    def _continuous_cells(
+        starts: array,
+        ends: array,
+        table: ZoneConverter,
+        user_column: bool
+    ) -> List[str]:
+        starts, ends = SlotArray(starts, ends).as_numpy()
+        local_starts = table.to_local_array(starts)
+        cells = time_labels(local_starts) + " - " + time_labels(table.to_local_array(ends))
+        if user_column:
+            cells = date_labels(local_starts) + " | " + cells
+        return cells.tolist()
+
+    @staticmethod
+    def _chunk_cells(
+        starts: array,
+        ends: array,
+        table: ZoneConverter,
+        user_column: bool,
+        granularity_minutes: int
+    ) -> List[str]:
+        step = granularity_minutes * 60
+        render_cells = chunk_user_cells if user_column else chunk_zone_cells
+        cells = []
+        for start, end in zip(starts, ends):
+            cells.extend(render_cells(start, end, step, table).tolist())
+        return cells
+
+    @staticmethod
+    def render_column_block(
+        starts: array,
+        ends: array,
+        zone: str,
+        user_column: bool,
+        output_format: str = "continuous",
+        granularity_minutes: int = 30
+    ) -> List[str]:
+        """Render one column of a date block, reusing ``block_cache`` when possible.
+
+        The user column holds the "date | time" cells and the recipient column
+        the converted time cells. Blocks are keyed on the content of their
+        intervals, so they are shared across requests and sessions.
+        """
+        column = "user" if user_column else "recipient"
+        key = make_block_key(starts, ends, zone, column, output_format, granularity_minutes)
+        cells = block_cache.get(key)
+        if cells is None:
+            table = get_zone_converter(zone)
+            if output_format == "continuous":
+                cells = AvailabilityService._continuous_cells(starts, ends, table, user_column)
+            else:  # chunks
+                cells = AvailabilityService._chunk_cells(
+                    starts, ends, table, user_column, granularity_minutes
+                )
+            block_cache.put(key, cells)
+        return cells
 
     @staticmethod
-    def _get_tz_name(dt: datetime) -> str:
-        # Helper to get the timezone name from a datetime or fallback to 'UTC'
-        if dt.tzinfo is not None:
-            # For pytz, tzinfo.zone gives the string name
-            return getattr(dt.tzinfo, 'zone', 'UTC')
-        return 'UTC'
+    def render_date_block(
+        starts: array,
+        ends: array,
+        user_tz: str,
+        recipient_tz: RecipientZones = None,
+        output_format: str = "continuous",
+        granularity_minutes: int = 30
+    ) -> List[str]:
+        """Render the rows of one date's intervals by joining its column blocks."""
+        columns = [AvailabilityService.render_column_block(
+            starts, ends, user_tz, True, output_format, granularity_minutes
+        )]
+        for zone in recipient_zones(recipient_tz):
+            columns.append(AvailabilityService.render_column_block(
+                starts, ends, zone, False, output_format, granularity_minutes
+            ))
+        if len(columns) == 1:
+            return columns[0]
+        return [" | ".join(cells) for cells in zip(*columns)]
+
+    @staticmethod
+    def _iter_continuous_rows(
+        starts: array,
+        ends: array,
+        user_tz: str,
+        recipient_tz: RecipientZones = None
+    ) -> Iterator[str]:
+        groups = AvailabilityService.group_by_date(starts, ends, user_tz)
+        for date_key in sorted(groups.keys()):
+            yield from AvailabilityService.render_date_block(
+                *groups[date_key], user_tz, recipient_tz, "continuous"
+            )
+
+    @staticmethod
+    def _iter_chunk_rows(
+        starts: array,
+        ends: array,
+        user_tz: str,
+        recipient_tz: RecipientZones = None,
+        granularity_minutes: int = 30
+    ) -> Iterator[str]:
+        # Streams in fixed-size windows instead of whole date blocks so one
+        # long slot never materializes all of its rows at once
+        user_table = get_zone_converter(user_tz)
+        recipient_tables = [get_zone_converter(zone) for zone in recipient_zones(recipient_tz)]
+        step = granularity_minutes * 60
+
+        starts, ends = AvailabilityService.order_by_date(starts, ends, user_tz)
+        for start, end in zip(starts, ends):
+            for first in range(0, chunk_count(start, end, step), CHUNK_BLOCK_SIZE):
+                yield from chunk_rows(
+                    start, end, step, user_table, recipient_tables,
+                    first=first, limit=CHUNK_BLOCK_SIZE
+                )
+
+    @staticmethod
+    def iter_continuous_output(
+        slots: List[TimeSlot],
+        user_tz: str,
+        recipient_tz: RecipientZones = None
+    ) -> Iterator[str]:
+        """Yield continuous format output one line at a time."""
+        yield from AvailabilityService.build_header(user_tz, recipient_tz)
+        starts, ends = AvailabilityService.normalize_slots(slots)
+        yield from AvailabilityService._iter_continuous_rows(starts, ends, user_tz, recipient_tz)
 
     @staticmethod
     def generate_continuous_output(
         slots: List[TimeSlot],
         user_tz: str,
-        recipient_tz: Optional[str] = None
+        recipient_tz: RecipientZones = None
     ) -> str:
         """Generate continuous format output."""
-        output = ["Here's my availability:\n"]
-        
-        # Add header
-        header = "Date        | My Timezone"
-        if recipient_tz:
-            header += f" ({user_tz}) | Recipient's Timezone ({recipient_tz})"
-        else:
-            header += f" ({user_tz})"
-        output.append(header)
-        output.append("-" * len(header))
+        return "\n".join(
+            AvailabilityService.iter_continuous_output(slots, user_tz, recipient_tz)
+        )
+
+    @staticmethod
+    def iter_chunks_output(
+        slots: List[TimeSlot],
+        user_tz: str,
+        recipient_tz: RecipientZones = None,
+        granularity_minutes: int = 30
+    ) -> Iterator[str]:
+        """Yield chunks format output one line at a time."""
+        yield from AvailabilityService.build_header(user_tz, recipient_tz)
+        starts, ends = AvailabilityService.normalize_slots(slots)
+        yield from AvailabilityService._iter_chunk_rows(
+            starts, ends, user_tz, recipient_tz, granularity_minutes
+        )
 
-        # Group slots by date
-        slots_by_date = {}
-        for slot in slots:
-            # Ensure the datetime is in the user's timezone
-            start_time = AvailabilityService.convert_timezone(
-                slot.start, AvailabilityService._get_tz_name(slot.start), user_tz
+    @staticmethod
+    def generate_chunks_output(
+        slots: List[TimeSlot],
+        user_tz: str,
+        recipient_tz: RecipientZones = None,
+        granularity_minutes: int = 30
+    ) -> str:
+        """Generate chunks format output."""
+        return "\n".join(AvailabilityService.iter_chunks_output(
+            slots, user_tz, recipient_tz, granularity_minutes
+        ))
+
+    @staticmethod
+    def iter_output(
+        slots: List[TimeSlot],
+        user_tz: str,
+        recipient_tz: RecipientZones = None,
+        output_format: str = "continuous",
+        granularity_minutes: int = 30,
+        intervals: Optional[SlotArray] = None
+    ) -> Iterator[str]:
+        """Return a line iterator over the output in the requested format.
+
+        The row limit is checked eagerly, so ``OutputTooLargeError`` is raised
+        here rather than part way through iteration. ``intervals`` may pass in
+        the already normalized slots.
+        """
+        starts, ends = intervals or AvailabilityService.normalize_slots(slots)
+        AvailabilityService.check_row_count(starts, ends, output_format, granularity_minutes)
+        if output_format == "continuous":
+            rows = AvailabilityService._iter_continuous_rows(starts, ends, user_tz, recipient_tz)
+        else:  # chunks
+            rows = AvailabilityService._iter_chunk_rows(
+                starts, ends, user_tz, recipient_tz, granularity_minutes
             )
-            end_time = AvailabilityService.convert_timezone(
-                slot.end, AvailabilityService._get_tz_name(slot.end), user_tz
+        return chain(AvailabilityService.build_header(user_tz, recipient_tz), rows)
+
+    @staticmethod
+    def generate_chunks_page(
+        slots: List[TimeSlot],
+        user_tz: str,
+        recipient_tz: RecipientZones = None,
+        granularity_minutes: int = 30,
+        limit: int = 1000,
+        cursor: Optional[str] = None
+    ) -> Tuple[str, Optional[str]]:
+        """Render one page of chunks output.
+
+        Returns the page text (header included) and the cursor for the next
+        page, or ``None`` on the last page. The page start is located from
+        per-interval chunk counts, so earlier rows are never rendered.
+        Raises ``InvalidCursorError`` for a cursor issued for another request.
+        """
+        starts, ends = AvailabilityService.normalize_slots(slots)
+        starts, ends = AvailabilityService.order_by_date(starts, ends, user_tz)
+        fingerprint = make_cache_key(starts, ends, user_tz, recipient_tz, "chunks", granularity_minutes)
+        offset = decode_cursor(cursor, fingerprint) if cursor else 0
+        user_table = get_zone_converter(user_tz)
+        recipient_tables = [get_zone_converter(zone) for zone in recipient_zones(recipient_tz)]
+        step = granularity_minutes * 60
+
+        counts = chunk_counts(starts, ends, step)
+        cumulative = np.cumsum(counts)
+        total = int(cumulative[-1]) if len(cumulative) else 0
+        index = int(np.searchsorted(cumulative, offset, side="right"))
+
+        output = AvailabilityService.build_header(user_tz, recipient_tz)
+        position = offset
+        while position < offset + limit and index < len(starts):
+            first = position - int(cumulative[index] - counts[index])
+            rows = chunk_rows(
+                starts[index], ends[index], step, user_table, recipient_tables,
+                first=first, limit=offset + limit - position
             )
-            
-            date_key = start_time.date()
-            if date_key not in slots_by_date:
-                slots_by_date[date_key] = []
-            slots_by_date[date_key].append((start_time, end_time))
-
-        # Generate output for each date
-        for date in sorted(slots_by_date.keys()):
-            for start_time, end_time in slots_by_date[date]:
-                date_str = AvailabilityService.format_date(start_time)
-                time_str = f"{AvailabilityService.format_time(start_time)} - {AvailabilityService.format_time(end_time)}"
-                
-                if recipient_tz:
-                    recipient_start = AvailabilityService.convert_timezone(start_time, user_tz, recipient_tz)
-                    recipient_end = AvailabilityService.convert_timezone(end_time, user_tz, recipient_tz)
-                    recipient_time = f"{AvailabilityService.format_time(recipient_start)} - {AvailabilityService.format_time(recipient_end)}"
-                    output.append(f"{date_str} | {time_str} | {recipient_time}")
-                else:
-                    output.append(f"{date_str} | {time_str}")
+            output.extend(rows)
+            position += len(rows)
+            index += 1
+
+        next_cursor = encode_cursor(position, fingerprint) if position < total else None
+        return "\n".join(output), next_cursor
+
+    @staticmethod
+    def fingerprint(
+        starts: array,
+        ends: array,
+        user_tz: str,
+        recipient_tz: RecipientZones = None,
+        output_format: str = "continuous",
+        granularity_minutes: int = 30
+    ) -> str:
+        """Return a stable hash of a normalized render request and the output version."""
+        key = make_cache_key(starts, ends, user_tz, recipient_tz, output_format, granularity_minutes)
+        return f"{OUTPUT_VERSION}-{key}"
+
+    @staticmethod
+    def count_rows(
+        starts: array,
+        ends: array,
+        output_format: str = "continuous",
+        granularity_minutes: int = 30
+    ) -> int:
+        """Return the number of table rows the normalized intervals render to."""
+        if output_format == "continuous":
+            return len(starts)
+        return total_chunk_count(starts, ends, granularity_minutes * 60)
+
+    @staticmethod
+    def check_row_count(
+        starts: array,
+        ends: array,
+        output_format: str = "continuous",
+        granularity_minutes: int = 30
+    ) -> int:
+        """Return the row count, raising ``OutputTooLargeError`` above ``settings.MAX_OUTPUT_ROWS``."""
+        row_count = AvailabilityService.count_rows(starts, ends, output_format, granularity_minutes)
+        if row_count > settings.MAX_OUTPUT_ROWS:
+            raise OutputTooLargeError(row_count, settings.MAX_OUTPUT_ROWS)
+        return row_count
+
+    @staticmethod
+    def render_rows(
+        starts: array,
+        ends: array,
+        user_tz: str,
+        recipient_tz: RecipientZones = None,
+        output_format: str = "continuous",
+        granularity_minutes: int = 30
+    ) -> List[str]:
+        """Render the table rows, without header, as a join of per-date blocks."""
+        rows = []
+        groups = AvailabilityService.group_by_date(starts, ends, user_tz)
+        for date_key in sorted(groups.keys()):
+            rows.extend(AvailabilityService.render_date_block(
+                *groups[date_key], user_tz, recipient_tz, output_format, granularity_minutes
+            ))
+        return rows
+
+    @staticmethod
+    def build_columns(
+        starts: array,
+        ends: array,
+        user_tz: str,
+        recipient_tz: RecipientZones = None,
+        output_format: str = "continuous",
+        granularity_minutes: int = 30
+    ) -> Dict[str, np.ndarray]:
+        """Convert normalized intervals to int64 columns, one entry per table row.
 
+        Returns UTC epoch ``start``/``end``, their local wall-clock seconds in
+        each zone and the user-zone ``day`` number, in the row order of the
+        rendered table. ``recipients`` holds a ``(zone, start, end)`` triple
+        per recipient zone, and ``recipient_start``/``recipient_end`` repeat
+        the first one. No text is formatted.
+        """
+        starts, ends = AvailabilityService.order_by_date(starts, ends, user_tz)
+        user_table = get_zone_converter(user_tz)
+        utc_starts = np.asarray(starts, dtype=np.int64)
+        utc_ends = np.asarray(ends, dtype=np.int64)
+        if output_format == "continuous":
+            user_starts = user_table.to_local_array(utc_starts)
+            user_ends = user_table.to_local_array(utc_ends)
+        else:  # chunks
+            slot_starts = utc_starts
+            utc_starts, utc_ends, source = chunk_intervals(
+                utc_starts, utc_ends, granularity_minutes * 60
+            )
+            # Same frozen user offset as the text rendering of chunks
+            user_offsets = (user_table.to_local_array(slot_starts) - slot_starts)[source]
+            user_starts = utc_starts + user_offsets
+            user_ends = utc_ends + user_offsets
+        columns = {
+            "day": user_starts // SECONDS_PER_DAY,
+            "start": utc_starts,
+            "end": utc_ends,
+            "user_start": user_starts,
+            "user_end": user_ends,
+        }
+        # The UTC instants are shared, so each extra zone is one bulk lookup
+        columns["recipients"] = [
+            (zone, table.to_local_array(utc_starts), table.to_local_array(utc_ends))
+            for zone, table in (
+                (zone, get_zone_converter(zone)) for zone in recipient_zones(recipient_tz)
+            )
+        ]
+        if columns["recipients"]:
+            _, columns["recipient_start"], columns["recipient_end"] = columns["recipients"][0]
+        return columns
+
+    @staticmethod
+    def generate_columns(
+        starts: array,
+        ends: array,
+        user_tz: str,
+        recipient_tz: RecipientZones = None,
+        output_format: str = "continuous",
+        granularity_minutes: int = 30
+    ) -> Dict[str, List]:
+        """Return the table rows as parallel lists, keyed like ``AvailabilityColumns``.
+
+        Raises ``OutputTooLargeError`` when the output would exceed the row limit.
+        """
+        AvailabilityService.check_row_count(starts, ends, output_format, granularity_minutes)
+        columns = AvailabilityService.build_columns(
+            starts, ends, user_tz, recipient_tz, output_format, granularity_minutes
+        )
+        days, date_index = np.unique(columns["day"], return_inverse=True)
+        labels = np.array([date_label(int(day)) for day in days], dtype=object)
+        result = {
+            "date": labels[date_index].tolist(),
+            "utc_start": columns["start"].tolist(),
+            "utc_end": columns["end"].tolist(),
+            "user_start": columns["user_start"].tolist(),
+            "user_end": columns["user_end"].tolist(),
+        }
+        if columns["recipients"]:
+            result["recipients"] = [
+                {"timezone": zone, "start": zone_starts.tolist(), "end": zone_ends.tolist()}
+                for zone, zone_starts, zone_ends in columns["recipients"]
+            ]
+            result["recipient_start"] = result["recipients"][0]["start"]
+            result["recipient_end"] = result["recipients"][0]["end"]
+        return result
+
+    @staticmethod
+    def build_compact_output(
+        starts: array,
+        ends: array,
+        user_tz: str,
+        recipient_tz: RecipientZones = None,
+        output_format: str = "continuous",
+        granularity_minutes: int = 30
+    ) -> Dict[str, object]:
+        """Build the compact columnar payload for machine clients.
+
+        Row starts are deltas from the previous row (the first from ``base``)
+        and ends are durations, all in seconds. Dates and UTC offsets are
+        indexes into the ``dates`` and ``offsets`` dictionaries, so repeated
+        values cost a digit or two per row. A row's local start in a zone is
+        ``start + offsets[<zone>_start_offset]``; every recipient zone is listed
+        under ``recipients`` and the ``recipient_*`` columns repeat the first.
+        Raises ``OutputTooLargeError`` when the output would exceed the row limit.
+        """
+        AvailabilityService.check_row_count(starts, ends, output_format, granularity_minutes)
+        columns = AvailabilityService.build_columns(
+            starts, ends, user_tz, recipient_tz, output_format, granularity_minutes
+        )
+        offset_columns = [
+            (columns["user_start"] - columns["start"], columns["user_end"] - columns["end"])
+        ]
+        for _, zone_starts, zone_ends in columns["recipients"]:
+            offset_columns.append((zone_starts - columns["start"], zone_ends - columns["end"]))
+        offsets = np.unique(np.concatenate([column for pair in offset_columns for column in pair]))
+        days, date_index = np.unique(columns["day"], return_inverse=True)
+        row_starts = columns["start"]
+        payload = {
+            "version": OUTPUT_VERSION,
+            "user_timezone": user_tz,
+            "recipient_timezones": list(recipient_zones(recipient_tz)),
+            "output_format": output_format,
+            "base": int(row_starts[0]) if len(row_starts) else 0,
+            "dates": [date_label(int(day)) for day in days],
+            "offsets": offsets.tolist(),
+            "date": date_index.tolist(),
+            "start": np.diff(row_starts, prepend=row_starts[:1]).tolist(),
+            "duration": (columns["end"] - row_starts).tolist(),
+        }
+        indexes = [
+            (np.searchsorted(offsets, start).tolist(), np.searchsorted(offsets, end).tolist())
+            for start, end in offset_columns
+        ]
+        payload["user_start_offset"], payload["user_end_offset"] = indexes[0]
+        if len(indexes) > 1:
+            payload["recipients"] = [
+                {"timezone": zone, "start_offset": start, "end_offset": end}
+                for (zone, _, _), (start, end) in zip(columns["recipients"], indexes[1:])
+            ]
+            payload["recipient_start_offset"], payload["recipient_end_offset"] = indexes[1]
+        return payload
+
+    @staticmethod
+    def render_text(
+        starts: array,
+        ends: array,
+        user_tz: str,
+        recipient_tz: RecipientZones = None,
+        output_format: str = "continuous",
+        granularity_minutes: int = 30
+    ) -> str:
+        """Render the full table for normalized intervals, bypassing the cache."""
+        output = AvailabilityService.build_header(user_tz, recipient_tz)
+        output.extend(AvailabilityService.render_rows(
+            starts, ends, user_tz, recipient_tz, output_format, granularity_minutes
+        ))
         return "\n".join(output)
 
     @staticmethod
-    def generate_chunks_output(
+    def generate_output(
         slots: List[TimeSlot],
         user_tz: str,
-        recipient_tz: Optional[str] = None,
+        recipient_tz: RecipientZones = None,
+        output_format: str = "continuous",
         granularity_minutes: int = 30
     ) -> str:
-        """Generate chunks format output."""
-        output = ["Here's my availability:\n"]
-        
-        # Add header
-        header = "Date        | My Timezone"
-        if recipient_tz:
-            header += f" ({user_tz}) | Recipient's Timezone ({recipient_tz})"
-        else:
-            header += f" ({user_tz})"
-        output.append(header)
-        output.append("-" * len(header))
+        """Generate output in the requested format, served from the render cache when possible.
 
-        # Generate chunks for each slot
-        for slot in slots:
-            # Ensure the datetime is in the user's timezone
-            current = AvailabilityService.convert_timezone(
-                slot.start, AvailabilityService._get_tz_name(slot.start), user_tz
-            )
-            end_time = AvailabilityService.convert_timezone(
-                slot.end, AvailabilityService._get_tz_name(slot.end), user_tz
+        Raises ``OutputTooLargeError`` when the output would exceed ``settings.MAX_OUTPUT_ROWS``.
+        """
+        starts, ends = AvailabilityService.normalize_slots(slots)
+        key = make_cache_key(starts, ends, user_tz, recipient_tz, output_format, granularity_minutes)
+        text_output = render_cache.get(key)
+        if text_output is None:
+            AvailabilityService.check_row_count(starts, ends, output_format, granularity_minutes)
+            text_output = AvailabilityService.render_text(
+                starts, ends, user_tz, recipient_tz, output_format, granularity_minutes
             )
-            
-            while current < end_time:
-                date_str = AvailabilityService.format_date(current)
-                time_str = AvailabilityService.format_time(current)
-                
-                if recipient_tz:
-                    recipient_time = AvailabilityService.convert_timezone(current, user_tz, recipient_tz)
-                    recipient_time_str = AvailabilityService.format_time(recipient_time)
-                    output.append(f"{date_str} | {time_str} | {recipient_time_str}")
-                else:
-                    output.append(f"{date_str} | {time_str}")
-                
-                current += timedelta(minutes=granularity_minutes)
-
-        return "\n".join(output) 
\ No newline at end of file
+            render_cache.put(key, text_output)
+        return text_output
+
+    @staticmethod
+    async def generate_output_async(
+        slots: List[TimeSlot],
+        user_tz: str,
+        recipient_tz: RecipientZones = None,
+        output_format: str = "continuous",
+        granularity_minutes: int = 30,
+        threaded: bool = False,
+        intervals: Optional[SlotArray] = None
+    ) -> str:
+        """Like ``generate_output``, but keeps large renders off the event loop.
+
+        Outputs of at least ``settings.OFFLOAD_ROW_THRESHOLD`` rows are rendered
+        in ``render_pool``. Smaller ones are rendered inline, or on a worker
+        thread when ``threaded`` is set so that several can run concurrently.
+        ``intervals`` may pass in the already normalized slots.
+        """
+        starts, ends = intervals or AvailabilityService.normalize_slots(slots)
+        key = make_cache_key(starts, ends, user_tz, recipient_tz, output_format, granularity_minutes)
+        text_output = render_cache.get(key)
+        if text_output is not None:
+            return text_output
+
+        row_count = AvailabilityService.check_row_count(
+            starts, ends, output_format, granularity_minutes
+        )
+        args = (starts, ends, user_tz, recipient_tz, output_format, granularity_minutes)
+        if row_count >= settings.OFFLOAD_ROW_THRESHOLD:
+            text_output = await render_pool.run(AvailabilityService.render_text, *args)
+        elif threaded:
+            text_output = await asyncio.to_thread(AvailabilityService.render_text, *args)
+        else:
+            text_output = AvailabilityService.render_text(*args)
+        render_cache.put(key, text_output)
+        return text_output
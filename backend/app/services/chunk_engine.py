@@ -0,0 +1,116 @@
+"""Vectorized row rendering for chunks output.
+
+All chunk boundaries of a slot are built as one int64 array of UTC epoch
+seconds, converted to each timezone in bulk, and turned into text by indexing
+the label tables in ``formatting`` instead of calling ``strftime`` per row.
+"""
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from app.services.formatting import date_labels, time_labels
+from app.services.timezone_engine import ZoneConverter
+
+
+def chunk_count(start: int, end: int, step: int) -> int:
+    """Return how many chunks of ``step`` seconds start within [start, end)."""
+    if end <= start:
+        return 0
+    return -((start - end) // step)
+
+
+def chunk_counts(starts: Sequence[int], ends: Sequence[int], step: int) -> np.ndarray:
+    """Return the number of chunks of each interval of parallel start/end columns."""
+    spans = np.asarray(ends, dtype=np.int64) - np.asarray(starts, dtype=np.int64)
+    return np.maximum(-(-spans // step), 0)
+
+
+def total_chunk_count(starts: Sequence[int], ends: Sequence[int], step: int) -> int:
+    """Return the total number of chunks over parallel start/end columns."""
+    return int(chunk_counts(starts, ends, step).sum())
+
+
+def chunk_intervals(
+    starts: Sequence[int],
+    ends: Sequence[int],
+    step: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Split parallel start/end columns into chunks of ``step`` seconds.
+
+    Returns the chunk starts, the chunk ends (clipped to their interval) and
+    the index of the interval each chunk came from.
+    """
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    counts = chunk_counts(starts, ends, step)
+    source = np.repeat(np.arange(len(starts)), counts)
+    # Position of each chunk within its own interval
+    within = np.arange(int(counts.sum()), dtype=np.int64)
+    within -= np.repeat(np.cumsum(counts) - counts, counts)
+    chunk_starts = starts[source] + within * step
+    return chunk_starts, np.minimum(chunk_starts + step, ends[source]), source
+
+
+def _chunk_instants(
+    start: int,
+    end: int,
+    step: int,
+    first: int = 0,
+    limit: Optional[int] = None
+) -> np.ndarray:
+    count = chunk_count(start, end, step) - first
+    if limit is not None:
+        count = min(count, limit)
+    return start + (first + np.arange(max(count, 0), dtype=np.int64)) * step
+
+
+def chunk_user_cells(
+    start: int,
+    end: int,
+    step: int,
+    user_table: ZoneConverter,
+    first: int = 0,
+    limit: Optional[int] = None
+) -> np.ndarray:
+    """Render the "date | time" cells of a slot's chunks in the user's timezone."""
+    instants = _chunk_instants(start, end, step, first, limit)
+    # The user column keeps the offset in force at the slot start and steps
+    # the wall clock from there, as the original pytz arithmetic did.
+    user_locals = instants + user_table.offset_at(start)
+    return date_labels(user_locals) + " | " + time_labels(user_locals)
+
+
+def chunk_zone_cells(
+    start: int,
+    end: int,
+    step: int,
+    table: ZoneConverter,
+    first: int = 0,
+    limit: Optional[int] = None
+) -> np.ndarray:
+    """Render the time cells of a slot's chunks in another timezone."""
+    instants = _chunk_instants(start, end, step, first, limit)
+    return time_labels(table.to_local_array(instants))
+
+
+def chunk_rows(
+    start: int,
+    end: int,
+    step: int,
+    user_table: ZoneConverter,
+    recipient_tables: Sequence[ZoneConverter] = (),
+    first: int = 0,
+    limit: Optional[int] = None
+) -> List[str]:
+    """Render the chunk rows of a single slot given in UTC epoch seconds.
+
+    ``first`` and ``limit`` select a window of the slot's chunks; the window
+    is located arithmetically, so earlier chunks are never materialized. The
+    chunk instants are built once and converted to each recipient zone in bulk.
+    """
+    instants = _chunk_instants(start, end, step, first, limit)
+    # Same frozen user offset as chunk_user_cells
+    user_locals = instants + user_table.offset_at(start)
+    rows = date_labels(user_locals) + " | " + time_labels(user_locals)
+    if len(rows):
+        for table in recipient_tables:
+            rows = rows + " | " + time_labels(table.to_local_array(instants))
+    return rows.tolist()
@@ -0,0 +1,61 @@
+"""Date and time labels for the rendered tables.
+
+Labels come from tables built once at import and are looked up by integer
+index, so rendering never calls ``strftime`` and the output does not depend
+on the process locale.
+"""
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+import numpy as np
+from app.services.timezone_engine import SECONDS_PER_DAY
+
+DAY_NAMES = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+MONTH_NAMES = (
+    "Jan", "Feb", "Mar", "Apr", "May", "Jun",
+    "Jul", "Aug", "Sep", "Oct", "Nov", "Dec",
+)
+EPOCH_DATE = date(1970, 1, 1)
+
+
+def _minute_label(minute: int) -> str:
+    hour, minute = divmod(minute, 60)
+    return f"{(hour - 1) % 12 + 1}:{minute:02d} {'AM' if hour < 12 else 'PM'}"
+
+
+# "9:00 AM"-style label for every minute of the day
+TIME_LABELS = np.array([_minute_label(minute) for minute in range(24 * 60)], dtype=object)
+
+
+@lru_cache(maxsize=4096)
+def ymd_label(year: int, month: int, day: int) -> str:
+    """Return the "Wed, Mar 20"-style label for a calendar date."""
+    weekday = date(year, month, day).weekday()
+    return f"{DAY_NAMES[weekday]}, {MONTH_NAMES[month - 1]} {day:02d}"
+
+
+def date_label(day: int) -> str:
+    """Return the date label for a day number since the epoch."""
+    value = EPOCH_DATE + timedelta(days=day)
+    return ymd_label(value.year, value.month, value.day)
+
+
+def date_labels(local_epochs: np.ndarray) -> np.ndarray:
+    """Return the date label of each local wall-clock epoch in an int64 array."""
+    days, inverse = np.unique(local_epochs // SECONDS_PER_DAY, return_inverse=True)
+    labels = np.array([date_label(int(day)) for day in days], dtype=object)
+    return labels[inverse]
+
+
+def time_labels(local_epochs: np.ndarray) -> np.ndarray:
+    """Return the time label of each local wall-clock epoch in an int64 array."""
+    return TIME_LABELS[(local_epochs % SECONDS_PER_DAY) // 60]
+
+
+def format_time(dt: datetime) -> str:
+    """Format a datetime as a "9:00 AM"-style time."""
+    return TIME_LABELS[dt.hour * 60 + dt.minute]
+
+
+def format_date(dt: datetime) -> str:
+    """Format a datetime as a "Wed, Mar 20"-style date."""
+    return ymd_label(dt.year, dt.month, dt.day)
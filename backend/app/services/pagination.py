@@ -0,0 +1,27 @@
+"""Opaque cursors for paging through chunks output."""
+import base64
+import json
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor is malformed or belongs to a different request."""
+
+
+def encode_cursor(offset: int, fingerprint: str) -> str:
+    """Encode the next row offset, tied to the request it was issued for."""
+    payload = json.dumps({"o": offset, "f": fingerprint[:16]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, fingerprint: str) -> int:
+    """Return the row offset stored in ``cursor``."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        offset = payload["o"]
+        cursor_fingerprint = payload["f"]
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursorError("Invalid cursor")
+    if not isinstance(offset, int) or offset < 0 or cursor_fingerprint != fingerprint[:16]:
+        raise InvalidCursorError("Invalid cursor for this request")
+    return offset
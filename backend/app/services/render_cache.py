@@ -0,0 +1,122 @@
+"""Bounded LRU caches for rendered availability tables and row blocks."""
+from array import array
+from collections import OrderedDict
+from hashlib import sha256
+from threading import Lock
+from typing import Any, Callable, Dict, Optional
+from app.services.timezone_engine import RecipientZones, recipient_zones
+
+
+def make_cache_key(
+    starts: array,
+    ends: array,
+    user_tz: str,
+    recipient_tz: RecipientZones,
+    output_format: str,
+    granularity_minutes: int
+) -> str:
+    """Hash a render request into a canonical key.
+
+    ``starts`` and ``ends`` are the normalized UTC epoch columns, so the same
+    availability sent as differently split or offset slots shares a key.
+    Granularity only matters for chunks.
+    """
+    recipients = ",".join(recipient_zones(recipient_tz))
+    if output_format != "chunks":
+        granularity_minutes = 0
+    digest = sha256(starts.tobytes())
+    digest.update(ends.tobytes())
+    digest.update(
+        f"|{user_tz}|{recipients}|{output_format}|{granularity_minutes}".encode()
+    )
+    return digest.hexdigest()
+
+
+def make_block_key(
+    starts: array,
+    ends: array,
+    zone: str,
+    column: str,
+    output_format: str,
+    granularity_minutes: int
+) -> str:
+    """Hash one column of a date block: its intervals, zone and rendering options."""
+    if output_format != "chunks":
+        granularity_minutes = 0
+    digest = sha256(starts.tobytes())
+    digest.update(ends.tobytes())
+    digest.update(f"|{column}|{zone}|{output_format}|{granularity_minutes}".encode())
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """Thread-safe LRU mapping of cache keys to rendered output.
+
+    Bounded by entry count and, when ``max_weight`` is set, by the total
+    ``weigh(value)`` of its entries; a value heavier than ``max_weight`` on
+    its own is not cached at all.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        max_weight: Optional[int] = None,
+        weigh: Callable[[Any], int] = len
+    ):
+        self.maxsize = maxsize
+        self.max_weight = max_weight
+        self._weigh = weigh
+        # Each entry holds its value and weight
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = Lock()
+        self.weight = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        weight = self._weigh(value) if self.max_weight is not None else 0
+        if self.max_weight is not None and weight > self.max_weight:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.weight -= previous[1]
+            self._entries[key] = (value, weight)
+            self.weight += weight
+            while len(self._entries) > self.maxsize or (
+                self.max_weight is not None and self.weight > self.max_weight
+            ):
+                _, (_, evicted_weight) = self._entries.popitem(last=False)
+                self.weight -= evicted_weight
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.weight = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "weight": self.weight,
+                "max_weight": self.max_weight,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
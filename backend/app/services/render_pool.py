@@ -0,0 +1,73 @@
+"""Bounded executor for rendering large outputs off the event loop."""
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Callable, Dict, Optional
+
+
+class RenderPoolFull(Exception):
+    """Raised when the pool already holds its maximum number of pending renders."""
+
+
+class RenderPool:
+    """Process or thread pool with a bounded queue and utilization counters."""
+
+    def __init__(self, kind: str = "process", max_workers: int = 2, max_pending: int = 32):
+        if kind not in ("process", "thread"):
+            raise ValueError("kind must be either 'process' or 'thread'")
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[Executor] = None
+        self._lock = Lock()
+        self.in_flight = 0
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> Executor:
+        # Created on first use so importing the app never spawns workers
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="render"
+                )
+        return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run ``fn(*args)`` in the pool, raising ``RenderPoolFull`` when saturated."""
+        with self._lock:
+            if self.in_flight >= self.max_pending:
+                self.rejected += 1
+                raise RenderPoolFull(f"{self.in_flight} renders already pending")
+            self.in_flight += 1
+            self.submitted += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.completed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            busy = min(self.in_flight, self.max_workers)
+            return {
+                "kind": self.kind,
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "busy_workers": busy,
+                "queue_depth": self.in_flight - busy,
+                "utilization": busy / self.max_workers if self.max_workers else 0.0,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
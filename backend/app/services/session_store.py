@@ -0,0 +1,150 @@
+"""In-memory availability sessions that re-render only the dates an edit touches.
+
+Sessions hold their merged intervals and render through the service's date
+blocks, so unchanged dates are served from ``block_cache``.
+"""
+from array import array
+from collections import OrderedDict
+import secrets
+import time
+from typing import Dict, List, Optional
+from app.core.config import settings
+from app.models.slot_array import SlotArray
+from app.schemas.availability import TimeSlot
+from app.services.availability_service import AvailabilityService
+
+
+class AvailabilitySession:
+    """Normalized intervals and render settings for one client."""
+
+    def __init__(
+        self,
+        session_id: str,
+        user_timezone: str,
+        recipient_timezone: Optional[str] = None,
+        output_format: str = "continuous",
+        slot_granularity_minutes: int = 30,
+        intervals: Optional[SlotArray] = None
+    ):
+        self.session_id = session_id
+        self.user_timezone = user_timezone
+        self.recipient_timezone = recipient_timezone
+        self.output_format = output_format
+        self.slot_granularity_minutes = slot_granularity_minutes
+        self.starts, self.ends = intervals or (array("q"), array("q"))
+        self.last_access = time.monotonic()
+
+    def add_slots(self, slots: List[TimeSlot]) -> None:
+        self.update(add_slots=slots)
+
+    def remove_slots(self, slots: List[TimeSlot]) -> None:
+        self.update(remove_slots=slots)
+
+    def configure(self, **changes) -> None:
+        """Update render settings."""
+        self.update(**changes)
+
+    def update(
+        self,
+        add_slots: Optional[List[TimeSlot]] = None,
+        remove_slots: Optional[List[TimeSlot]] = None,
+        **changes
+    ) -> None:
+        """Apply slot deltas and render setting changes together.
+
+        Removals are applied first. Raises ``OutputTooLargeError`` and leaves
+        the session unchanged when the result would exceed the row limit.
+        """
+        starts, ends = self.starts, self.ends
+        if remove_slots:
+            starts, ends = AvailabilityService.subtract_intervals(
+                starts, ends, *AvailabilityService.normalize_slots(remove_slots)
+            )
+        if add_slots:
+            starts, ends = AvailabilityService.merge_intervals(
+                SlotArray(starts, ends).concat(AvailabilityService.normalize_slots(add_slots))
+            )
+        AvailabilityService.check_row_count(
+            starts,
+            ends,
+            changes.get("output_format", self.output_format),
+            changes.get("slot_granularity_minutes", self.slot_granularity_minutes)
+        )
+        for name, value in changes.items():
+            setattr(self, name, value)
+        self.starts, self.ends = starts, ends
+
+    def row_count(self) -> int:
+        return AvailabilityService.check_row_count(
+            self.starts, self.ends, self.output_format, self.slot_granularity_minutes
+        )
+
+    def render(self) -> str:
+        """Render the table, reusing the cached blocks of unchanged dates.
+
+        Raises ``OutputTooLargeError`` when the output would exceed the row limit.
+        """
+        self.row_count()
+        output = AvailabilityService.build_header(self.user_timezone, self.recipient_timezone)
+        output.extend(AvailabilityService.render_rows(
+            self.starts,
+            self.ends,
+            self.user_timezone,
+            self.recipient_timezone,
+            self.output_format,
+            self.slot_granularity_minutes
+        ))
+        return "\n".join(output)
+
+
+class SessionStore:
+    """Bounded session map with idle expiry, evicting least recently used first."""
+
+    def __init__(self, max_sessions: int, idle_seconds: float):
+        self.max_sessions = max_sessions
+        self.idle_seconds = idle_seconds
+        self._sessions: "OrderedDict[str, AvailabilitySession]" = OrderedDict()
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _evict_idle(self, now: float) -> None:
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if now - session.last_access <= self.idle_seconds:
+                break
+            self._sessions.popitem(last=False)
+            self.evictions += 1
+
+    def create(self, **render_settings) -> AvailabilitySession:
+        now = time.monotonic()
+        self._evict_idle(now)
+        session = AvailabilitySession(secrets.token_urlsafe(16), **render_settings)
+        self._sessions[session.session_id] = session
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+            self.evictions += 1
+        return session
+
+    def get(self, session_id: str) -> Optional[AvailabilitySession]:
+        now = time.monotonic()
+        self._evict_idle(now)
+        session = self._sessions.get(session_id)
+        if session is not None:
+            session.last_access = now
+            self._sessions.move_to_end(session_id)
+        return session
+
+    def delete(self, session_id: str) -> bool:
+        return self._sessions.pop(session_id, None) is not None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "evictions": self.evictions,
+        }
+
+
+session_store = SessionStore(settings.MAX_SESSIONS, settings.SESSION_IDLE_SECONDS)
@@ -0,0 +1,98 @@
+"""Interchangeable timezone conversion backends.
+
+``settings.TIMEZONE_BACKEND`` selects how zones are resolved and instants
+converted:
+
+- ``table``: precomputed transition tables (``ZoneTable``), a bisect or one
+  vectorized search per conversion. The default.
+- ``pytz``: a pytz ``astimezone`` round trip per instant.
+- ``zoneinfo``: the standard library's ``zoneinfo`` with the system tz
+  database, one ``astimezone`` per instant.
+
+All three expose the ``ZoneConverter`` interface, so the service code does
+not depend on the backend in use.
+"""
+from datetime import datetime, timezone, tzinfo
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+import pytz
+from app.core.config import settings
+from app.services.timezone_engine import ZoneConverter, canonical_zone, get_zone, get_zone_table
+
+try:
+    import zoneinfo
+except ImportError:  # pragma: no cover - Python < 3.9
+    zoneinfo = None
+
+
+def _utc_datetime(epoch: int) -> datetime:
+    return datetime.fromtimestamp(epoch, timezone.utc)
+
+
+class PytzZone(ZoneConverter):
+    """Converts each instant with a pytz ``astimezone`` round trip."""
+
+    __slots__ = ("name", "_zone")
+
+    def __init__(self, name: str):
+        self.name = name
+        self._zone = get_zone(name)
+
+    @property
+    def tzinfo(self) -> tzinfo:
+        return self._zone
+
+    def offset_at(self, epoch: int) -> int:
+        return int(_utc_datetime(epoch).astimezone(self._zone).utcoffset().total_seconds())
+
+
+class ZoneinfoZone(ZoneConverter):
+    """Converts each instant with the standard library's ``zoneinfo``."""
+
+    __slots__ = ("name", "_zone")
+
+    def __init__(self, name: str):
+        if zoneinfo is None:
+            raise RuntimeError("The zoneinfo timezone backend requires Python 3.9 or later")
+        self.name = name
+        try:
+            self._zone = zoneinfo.ZoneInfo(name)
+        except zoneinfo.ZoneInfoNotFoundError:
+            # Keep the error type the other backends raise for unknown zones
+            raise pytz.exceptions.UnknownTimeZoneError(name)
+
+    @property
+    def tzinfo(self) -> tzinfo:
+        return self._zone
+
+    def offset_at(self, epoch: int) -> int:
+        return int(_utc_datetime(epoch).astimezone(self._zone).utcoffset().total_seconds())
+
+
+BACKENDS: Dict[str, Callable[[str], ZoneConverter]] = {
+    "table": get_zone_table,
+    "pytz": PytzZone,
+    "zoneinfo": ZoneinfoZone,
+}
+
+
+@lru_cache(maxsize=None)
+def _converter(backend: str, name: str) -> ZoneConverter:
+    try:
+        factory = BACKENDS[backend]
+    except KeyError:
+        raise ValueError(
+            f"Unknown timezone backend: {backend!r}. Must be one of {', '.join(BACKENDS)}"
+        )
+    return factory(name)
+
+
+def get_zone_converter(name: str, backend: Optional[str] = None) -> ZoneConverter:
+    """Return the cached converter for ``name`` from ``backend``.
+
+    ``backend`` defaults to ``settings.TIMEZONE_BACKEND``. Names are matched
+    case-insensitively, as in pytz, and converters are cached on the
+    canonical spelling. Raises ``pytz.exceptions.UnknownTimeZoneError`` for
+    unknown zones and ``ValueError`` for an unknown backend.
+    """
+    return _converter(backend or settings.TIMEZONE_BACKEND, canonical_zone(name))
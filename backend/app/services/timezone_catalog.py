@@ -0,0 +1,124 @@
+"""Catalog of IANA timezone names, aliases, current offsets and abbreviations.
+
+The names and the alias links come from the tz database that ships with pytz,
+so the set is fixed for the life of the process and zone validation is a
+frozenset lookup. Offsets and abbreviations are taken at build time; the
+catalog is rebuilt only once a zone's next UTC transition has passed.
+"""
+from bisect import bisect_right
+from datetime import datetime
+from hashlib import sha256
+import json
+from threading import Lock
+import time
+from typing import Dict, List, Optional
+import pytz
+from app.services.timezone_engine import get_zone, get_zone_table
+
+
+def _read_links() -> Dict[str, str]:
+    """Return each alias in the tz database mapped to its canonical zone."""
+    links = {}
+    with pytz.open_resource("tzdata.zi") as source:
+        for line in source.read().decode().splitlines():
+            # "L Target Alias" lines link an alias to its target zone
+            if line.startswith("L "):
+                _, target, alias = line.split()
+                links[alias] = target
+    names = set(pytz.all_timezones)
+    resolved = {}
+    for alias, target in links.items():
+        while target in links:
+            target = links[target]
+        if alias in names and target in names:
+            resolved[alias] = target
+    return resolved
+
+
+ALIASES = _read_links()
+ZONE_NAMES = frozenset(pytz.all_timezones)
+CANONICAL_ZONES = tuple(sorted(ZONE_NAMES.difference(ALIASES)))
+# pytz accepts zone names in any case
+_FOLDED_ZONE_NAMES = frozenset(name.lower() for name in ZONE_NAMES)
+
+
+def is_known_zone(name: str) -> bool:
+    """Return whether ``name`` is a zone or alias ``get_zone`` accepts."""
+    return name in ZONE_NAMES or name.lower() in _FOLDED_ZONE_NAMES
+
+
+def zone_abbreviation(name: str, epoch: int) -> str:
+    """Return the abbreviation in force in ``name`` at ``epoch``, e.g. "PDT"."""
+    return datetime.fromtimestamp(epoch, get_zone(name)).tzname()
+
+
+class TimezoneCatalog:
+    """Serialized catalog body with its ETag and the instant it goes stale."""
+
+    __slots__ = ("body", "etag", "built_at", "valid_until")
+
+    def __init__(self, body: bytes, built_at: int, valid_until: int):
+        self.body = body
+        self.etag = f'"{sha256(body).hexdigest()[:32]}"'
+        self.built_at = built_at
+        self.valid_until = valid_until
+
+    def covers(self, now: int) -> bool:
+        return self.built_at <= now < self.valid_until
+
+    def max_age(self, now: int, limit: int) -> int:
+        """Seconds a client may reuse the catalog, at most ``limit``."""
+        return max(0, min(limit, self.valid_until - now))
+
+
+def build_catalog(now: int) -> TimezoneCatalog:
+    """Build the catalog as of UTC epoch second ``now``."""
+    aliases: Dict[str, List[str]] = {}
+    for alias, target in sorted(ALIASES.items()):
+        aliases.setdefault(target, []).append(alias)
+    zones = []
+    valid_until: Optional[int] = None
+    for name in CANONICAL_ZONES:
+        table = get_zone_table(name)
+        zones.append({
+            "name": name,
+            "offset": table.offset_at(now),
+            "abbreviation": zone_abbreviation(name, now),
+            "aliases": aliases.get(name, []),
+        })
+        idx = bisect_right(table.transitions, now)
+        if idx < len(table.transitions):
+            transition = table.transitions[idx]
+            if valid_until is None or transition < valid_until:
+                valid_until = transition
+    body = json.dumps({
+        "tzdata_version": pytz.OLSON_VERSION,
+        # Offsets only change at transitions, so workers that built the catalog
+        # at different times still serve identical bodies and ETags
+        "valid_until": valid_until,
+        "zones": zones,
+        "aliases": ALIASES,
+    }, separators=(",", ":")).encode()
+    # pytz tables end in 2037; past that nothing changes
+    return TimezoneCatalog(body, now, valid_until if valid_until is not None else 2**62)
+
+
+class _CatalogHolder:
+    def __init__(self):
+        self._catalog: Optional[TimezoneCatalog] = None
+        self._lock = Lock()
+
+    def get(self, now: Optional[int] = None) -> TimezoneCatalog:
+        """Return the catalog for ``now``, rebuilding it once a transition has passed."""
+        if now is None:
+            now = int(time.time())
+        catalog = self._catalog
+        if catalog is None or not catalog.covers(now):
+            with self._lock:
+                catalog = self._catalog
+                if catalog is None or not catalog.covers(now):
+                    catalog = self._catalog = build_catalog(now)
+        return catalog
+
+
+timezone_catalog = _CatalogHolder()
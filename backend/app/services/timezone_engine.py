@@ -0,0 +1,195 @@
+"""Precomputed UTC-offset transition tables for fast timezone conversion.
+
+pytz already stores every zone as a sorted list of UTC transition instants
+together with the offset that applies after each one. This module lifts those
+lists into plain integer tables once per zone, so converting an instant is a
+single bisect instead of a ``localize``/``astimezone`` round trip. Because the
+tables come straight from pytz, the results match pytz across DST boundaries.
+
+``ZoneTable`` implements ``ZoneConverter``, the interface shared with the
+pytz and zoneinfo backends in ``timezone_backends``.
+"""
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+from datetime import datetime, timedelta, tzinfo
+from functools import lru_cache
+from typing import List, Sequence, Tuple, Union
+import numpy as np
+import pytz
+from app.core.timing import stage
+
+EPOCH = datetime(1970, 1, 1)
+EPOCH_UTC = pytz.utc.localize(EPOCH)
+SECONDS_PER_DAY = 86400
+# Skipped wall-clock times are resolved from this far before the gap, as pytz does
+SKIPPED_TIME_SHIFT = timedelta(hours=6)
+
+# Canonical zone names by their lower-case form, as pytz matches names in any case
+_ZONES_BY_FOLDED_NAME = {name.lower(): name for name in pytz.all_timezones}
+
+# A recipient zone argument: none, one zone name or several
+RecipientZones = Union[str, Sequence[str], None]
+
+
+class ZoneConverter(ABC):
+    """Converts between UTC epoch seconds and wall-clock time in one zone.
+
+    Backends implement ``offset_at`` and ``tzinfo``; the bulk conversions
+    default to per-instant loops and are overridden where a backend can do
+    better.
+    """
+
+    __slots__ = ()
+
+    name: str
+
+    @property
+    @abstractmethod
+    def tzinfo(self) -> tzinfo:
+        """The zone as a ``datetime.tzinfo``."""
+
+    @abstractmethod
+    def offset_at(self, epoch: int) -> int:
+        """Return the UTC offset in seconds in force at ``epoch``."""
+
+    def to_local(self, epoch: int) -> int:
+        """Convert UTC epoch seconds to local wall-clock epoch seconds."""
+        return epoch + self.offset_at(epoch)
+
+    def to_local_array(self, epochs: np.ndarray) -> np.ndarray:
+        """Convert an int64 array of UTC epoch seconds to local wall-clock seconds."""
+        with stage("convert"):
+            offsets = np.fromiter(
+                (self.offset_at(epoch) for epoch in epochs.tolist()),
+                dtype=np.int64,
+                count=len(epochs)
+            )
+            return epochs + offsets
+
+    def localize(self, naive: datetime) -> int:
+        """Return the UTC epoch second at which this zone's clocks read ``naive``.
+
+        Matches pytz's ``localize`` with ``is_dst=False``: an ambiguous time
+        is read as standard time (the later instant if that does not decide
+        it), and a skipped time with the offset in force before the gap.
+        """
+        local = _seconds_since_epoch(naive)
+        candidates = {
+            local - self.offset_at(local - SECONDS_PER_DAY),
+            local - self.offset_at(local + SECONDS_PER_DAY),
+        }
+        valid = [epoch for epoch in candidates if self.to_local(epoch) == local]
+        if len(valid) > 1:
+            # Zones such as Europe/Dublin flag winter time as DST
+            standard = [epoch for epoch in valid if not self.to_datetime(epoch).dst()]
+            if len(standard) == 1:
+                return standard[0]
+        if valid:
+            return max(valid)
+        return self.localize(naive - SKIPPED_TIME_SHIFT) + int(SKIPPED_TIME_SHIFT.total_seconds())
+
+    def to_datetime(self, epoch: int) -> datetime:
+        """Return UTC epoch seconds as an aware ``datetime`` in this zone."""
+        return datetime.fromtimestamp(epoch, self.tzinfo)
+
+
+class ZoneTable(ZoneConverter):
+    """UTC-offset transition table for a single IANA timezone."""
+
+    __slots__ = ("name", "transitions", "offsets", "transition_array", "offset_array")
+
+    def __init__(self, name: str, transitions: List[int], offsets: List[int]):
+        self.name = name
+        # transitions[i] is the UTC epoch second from which offsets[i] applies
+        self.transitions = transitions
+        self.offsets = offsets
+        self.transition_array = np.array(transitions, dtype=np.int64)
+        self.offset_array = np.array(offsets, dtype=np.int64)
+
+    @property
+    def tzinfo(self) -> tzinfo:
+        return get_zone(self.name)
+
+    def offset_at(self, epoch: int) -> int:
+        """Return the UTC offset in seconds in force at ``epoch``."""
+        idx = bisect_right(self.transitions, epoch) - 1
+        return self.offsets[idx if idx > 0 else 0]
+
+    def to_local_array(self, epochs: np.ndarray) -> np.ndarray:
+        """Convert an int64 array of UTC epoch seconds to local wall-clock seconds."""
+        with stage("convert"):
+            idx = np.searchsorted(self.transition_array, epochs, side="right") - 1
+            np.maximum(idx, 0, out=idx)
+            return epochs + self.offset_array[idx]
+
+
+def _seconds_since_epoch(dt: datetime) -> int:
+    delta = dt - EPOCH
+    return delta.days * SECONDS_PER_DAY + delta.seconds
+
+
+def _build_table(name: str, zone: pytz.BaseTzInfo) -> ZoneTable:
+    if isinstance(zone, pytz.tzinfo.DstTzInfo):
+        transitions = [_seconds_since_epoch(t) for t in zone._utc_transition_times]
+        offsets = [
+            int(utcoffset.total_seconds()) for utcoffset, _, _ in zone._transition_info
+        ]
+        return ZoneTable(name, transitions, offsets)
+    # UTC and StaticTzInfo zones have a single fixed offset
+    offset = zone.utcoffset(EPOCH)
+    return ZoneTable(name, [0], [int(offset.total_seconds())])
+
+
+def canonical_zone(name: str) -> str:
+    """Return the canonical spelling of zone ``name``, which may be in any case.
+
+    Raises ``pytz.exceptions.UnknownTimeZoneError`` for unknown zones.
+    """
+    if name in pytz.all_timezones_set:
+        return name
+    try:
+        return _ZONES_BY_FOLDED_NAME[name.lower()]
+    except KeyError:
+        raise pytz.exceptions.UnknownTimeZoneError(name)
+
+
+@lru_cache(maxsize=None)
+def _load_zone(name: str) -> pytz.BaseTzInfo:
+    return pytz.timezone(name)
+
+
+@lru_cache(maxsize=None)
+def _load_zone_table(name: str) -> ZoneTable:
+    return _build_table(name, _load_zone(name))
+
+
+def get_zone(name: str) -> pytz.BaseTzInfo:
+    """Return the pytz zone for ``name``, resolving each zone only once."""
+    # Cached on the canonical name, so case variants share one entry and the
+    # caches never hold more than one per zone
+    return _load_zone(canonical_zone(name))
+
+
+def get_zone_table(name: str) -> ZoneTable:
+    """Return the cached transition table for ``name``.
+
+    Raises ``pytz.exceptions.UnknownTimeZoneError`` for unknown zones.
+    """
+    return _load_zone_table(canonical_zone(name))
+
+
+def recipient_zones(recipient_tz: RecipientZones) -> Tuple[str, ...]:
+    """Return the recipient zone names of ``recipient_tz`` as a tuple."""
+    if not recipient_tz:
+        return ()
+    if isinstance(recipient_tz, str):
+        return (recipient_tz,)
+    return tuple(recipient_tz)
+
+
+def to_epoch(dt: datetime) -> int:
+    """Return whole UTC epoch seconds for ``dt``; naive values are read as UTC."""
+    if dt.tzinfo is None:
+        return _seconds_since_epoch(dt)
+    delta = dt - EPOCH_UTC
+    return delta.days * SECONDS_PER_DAY + delta.seconds
@@ -3,6 +3,7 @@ import pytz
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
+from app.api.v1.endpoints.availability import COMPACT_JSON_MEDIA_TYPE
 from app.core.config import settings
 from app.schemas.availability import TimeSlot
 
@@ -103,4 +104,322 @@ def test_invalid_output_format(sample_request_data):
     if response.status_code != 400:
         print(f"Error response: {response.json()}")
     assert response.status_code == 400
-    assert "Invalid output_format" in response.json()["detail"] 
\ No newline at end of file
+    assert "Invalid output_format" in response.json()["detail"]
+
+def test_generate_availability_streaming(sample_request_data):
+    sample_request_data["output_format"] = "chunks"
+    headers = {"X-API-Key": settings.API_KEY}
+    expected = client.post(
+        "/api/v1/availability", json=sample_request_data, headers=headers
+    ).json()["text_output"]
+
+    response = client.post(
+        "/api/v1/availability?stream=true", json=sample_request_data, headers=headers
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert response.text == expected
+
+    response = client.post(
+        "/api/v1/availability",
+        json=sample_request_data,
+        headers={**headers, "Accept": "text/plain"}
+    )
+    assert response.status_code == 200
+    assert response.text == expected
+
+@pytest.mark.parametrize("accept", [
+    "application/json, text/plain, */*",
+    "application/json, text/plain;q=0.1",
+    "text/plain;q=0.5, */*;q=0.5",
+    "*/*",
+])
+def test_accept_headers_that_keep_json(sample_request_data, accept):
+    response = client.post(
+        "/api/v1/availability",
+        json=sample_request_data,
+        headers={"X-API-Key": settings.API_KEY, "Accept": accept}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert "text_output" in response.json()
+
+def test_malformed_request_body():
+    response = client.post(
+        "/api/v1/availability",
+        content=b'{"selected_slots": [',
+        headers={"X-API-Key": settings.API_KEY, "Content-Type": "application/json"}
+    )
+    assert response.status_code == 400
+    assert "Invalid request body" in response.json()["detail"]
+
+def test_generate_availability_batch(sample_request_data):
+    chunks_item = {**sample_request_data, "output_format": "chunks"}
+    bad_zone_item = {**sample_request_data, "user_timezone": "Invalid/Timezone"}
+    response = client.post(
+        "/api/v1/availability/batch",
+        json={"items": [sample_request_data, bad_zone_item, chunks_item]},
+        headers={"X-API-Key": settings.API_KEY}
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert len(results) == 3
+    assert results[0]["error"] is None
+    assert "Wed, Mar 20" in results[0]["result"]["text_output"]
+    assert results[1]["result"] is None
+    assert "Invalid timezone" in results[1]["error"]
+    assert "9:30 AM" in results[2]["result"]["text_output"]
+
+def test_batch_rejects_too_many_rows_in_total(sample_request_data, monkeypatch):
+    # Two rows per item
+    monkeypatch.setattr(settings, "MAX_BATCH_ROWS", 4)
+    response = client.post(
+        "/api/v1/availability/batch",
+        json={"items": [sample_request_data] * 3},
+        headers={"X-API-Key": settings.API_KEY}
+    )
+    assert response.status_code == 400
+    assert "6 rows" in response.json()["detail"]
+
+    response = client.post(
+        "/api/v1/availability/batch",
+        json={"items": [sample_request_data] * 2},
+        headers={"X-API-Key": settings.API_KEY}
+    )
+    assert response.status_code == 200
+
+def test_batch_rejects_invalid_api_key(sample_request_data):
+    response = client.post(
+        "/api/v1/availability/batch",
+        json={"items": [sample_request_data]},
+        headers={"X-API-Key": "invalid-key"}
+    )
+    assert response.status_code == 401
+
+def test_invalid_granularity(sample_request_data):
+    sample_request_data["output_format"] = "chunks"
+    sample_request_data["slot_granularity_minutes"] = 0
+    response = client.post(
+        "/api/v1/availability",
+        json=sample_request_data,
+        headers={"X-API-Key": settings.API_KEY}
+    )
+    assert response.status_code == 400
+    assert "slot_granularity_minutes" in response.json()["detail"]
+
+@pytest.mark.parametrize("query", ["", "?stream=true"])
+def test_output_too_large(query):
+    request_data = {
+        "selected_slots": [
+            {"start": "2024-01-01T00:00:00+00:00", "end": "2024-04-01T00:00:00+00:00"}
+        ],
+        "user_timezone": "UTC",
+        "output_format": "chunks",
+        "slot_granularity_minutes": 1
+    }
+    response = client.post(
+        f"/api/v1/availability{query}",
+        json=request_data,
+        headers={"X-API-Key": settings.API_KEY}
+    )
+    assert response.status_code == 400
+    assert "Output too large: 131040 rows" in response.json()["detail"]
+
+def test_paginated_chunks(sample_request_data):
+    sample_request_data["output_format"] = "chunks"
+    headers = {"X-API-Key": settings.API_KEY}
+    response = client.post(
+        "/api/v1/availability?limit=4", json=sample_request_data, headers=headers
+    )
+    assert response.status_code == 200
+    first_page = response.json()
+    assert len(first_page["text_output"].split("\n")[4:]) == 4
+    assert first_page["next_cursor"]
+
+    response = client.post(
+        f"/api/v1/availability?limit=4&cursor={first_page['next_cursor']}",
+        json=sample_request_data,
+        headers=headers
+    )
+    assert response.status_code == 200
+    last_page = response.json()
+    assert "Thu, Mar 21 | 9:30 AM" in last_page["text_output"]
+    assert last_page["next_cursor"] is None
+
+def test_pagination_requires_chunks(sample_request_data):
+    response = client.post(
+        "/api/v1/availability?limit=4",
+        json=sample_request_data,
+        headers={"X-API-Key": settings.API_KEY}
+    )
+    assert response.status_code == 400
+    assert "Pagination" in response.json()["detail"]
+
+def test_conditional_post_fails_precondition(sample_request_data):
+    headers = {"X-API-Key": settings.API_KEY}
+    response = client.post("/api/v1/availability", json=sample_request_data, headers=headers)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"] == f"private, max-age={settings.CACHE_MAX_AGE}"
+
+    for if_none_match in (f"W/{etag}", "*"):
+        response = client.post(
+            "/api/v1/availability",
+            json=sample_request_data,
+            headers={**headers, "If-None-Match": if_none_match}
+        )
+        assert response.status_code == 412
+        assert response.headers["etag"] == etag
+        assert response.content == b""
+
+    sample_request_data["recipient_timezone"] = "Europe/London"
+    response = client.post(
+        "/api/v1/availability",
+        json=sample_request_data,
+        headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+def test_etag_differs_between_json_and_stream(sample_request_data):
+    headers = {"X-API-Key": settings.API_KEY}
+    json_response = client.post("/api/v1/availability", json=sample_request_data, headers=headers)
+    stream_response = client.post(
+        "/api/v1/availability?stream=true", json=sample_request_data, headers=headers
+    )
+    assert stream_response.headers["etag"] != json_response.headers["etag"]
+
+def test_large_responses_are_compressed(sample_request_data):
+    sample_request_data["output_format"] = "chunks"
+    sample_request_data["slot_granularity_minutes"] = 5
+    headers = {"X-API-Key": settings.API_KEY, "Accept-Encoding": "gzip"}
+    response = client.post("/api/v1/availability", json=sample_request_data, headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert "Thu, Mar 21 | 9:55 AM" in response.json()["text_output"]
+
+    response = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+def test_compact_columnar_output(sample_request_data):
+    response = client.post(
+        "/api/v1/availability",
+        json=sample_request_data,
+        headers={
+            "X-API-Key": settings.API_KEY,
+            "Accept": "application/vnd.timetext.columns+json",
+        }
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.timetext.columns+json"
+    data = response.json()
+    assert data["dates"] == ["Wed, Mar 20", "Thu, Mar 21"]
+    assert data["date"] == [0, 1]
+    assert data["start"] == [0, 24 * 3600]
+    assert data["duration"] == [2 * 3600, 3600]
+    assert data["offsets"] == [-7 * 3600, -4 * 3600]
+    assert data["user_start_offset"] == [1, 1]
+    assert data["recipient_start_offset"] == [0, 0]
+
+@pytest.mark.parametrize("accept, compact", [
+    ("application/json, application/vnd.timetext.columns+json;q=0", False),
+    ("application/json;q=0.5, application/vnd.timetext.columns+json", True),
+    ("application/vnd.timetext.columns+json, */*", False),
+    ("application/json, application/msgpack;q=0.5", False),
+])
+def test_compact_output_follows_q_values(sample_request_data, accept, compact):
+    response = client.post(
+        "/api/v1/availability",
+        json=sample_request_data,
+        headers={"X-API-Key": settings.API_KEY, "Accept": accept}
+    )
+    assert response.status_code == 200
+    assert (response.headers["content-type"] == COMPACT_JSON_MEDIA_TYPE) == compact
+
+def test_unacceptable_representation(sample_request_data, monkeypatch):
+    monkeypatch.setattr("app.api.v1.endpoints.availability.msgpack", None)
+    response = client.post(
+        "/api/v1/availability",
+        json=sample_request_data,
+        headers={"X-API-Key": settings.API_KEY, "Accept": "application/msgpack"}
+    )
+    assert response.status_code == 406
+
+def test_columns_response_format(sample_request_data):
+    sample_request_data["output_format"] = "chunks"
+    sample_request_data["response_format"] = "columns"
+    response = client.post(
+        "/api/v1/availability",
+        json=sample_request_data,
+        headers={"X-API-Key": settings.API_KEY}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["text_output"] is None
+    columns = data["columns"]
+    assert columns["date"] == ["Wed, Mar 20"] * 4 + ["Thu, Mar 21"] * 2
+    assert columns["utc_end"][0] - columns["utc_start"][0] == 30 * 60
+    assert columns["user_start"][0] - columns["utc_start"][0] == -4 * 3600
+    assert columns["recipient_start"][0] - columns["utc_start"][0] == -7 * 3600
+
+def test_invalid_response_format(sample_request_data):
+    sample_request_data["response_format"] = "csv"
+    response = client.post(
+        "/api/v1/availability",
+        json=sample_request_data,
+        headers={"X-API-Key": settings.API_KEY}
+    )
+    assert response.status_code == 400
+    assert "response_format" in response.json()["detail"]
+
+@pytest.mark.parametrize("start", [1710925200, 1710925200.5, "1710925200", "20240320T0900"])
+def test_slot_times_must_be_iso_strings(sample_request_data, start):
+    sample_request_data["selected_slots"][0]["start"] = start
+    response = client.post(
+        "/api/v1/availability",
+        json=sample_request_data,
+        headers={"X-API-Key": settings.API_KEY}
+    )
+    assert response.status_code == 400
+
+def test_mixed_naive_and_aware_slots(sample_request_data):
+    # Naive times are read as UTC: 13:00Z is 9:00 AM in New York
+    sample_request_data["selected_slots"].append(
+        {"start": "2024-03-22T13:00:00", "end": "2024-03-22T14:00:00"}
+    )
+    response = client.post(
+        "/api/v1/availability",
+        json=sample_request_data,
+        headers={"X-API-Key": settings.API_KEY}
+    )
+    assert response.status_code == 200
+    assert "Fri, Mar 22 | 9:00 AM - 10:00 AM" in response.json()["text_output"]
+
+def test_multiple_recipient_timezones(sample_request_data):
+    sample_request_data["recipient_timezones"] = ["Europe/London", "America/Los_Angeles"]
+    response = client.post(
+        "/api/v1/availability",
+        json=sample_request_data,
+        headers={"X-API-Key": settings.API_KEY}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["recipient_timezones"] == ["America/Los_Angeles", "Europe/London"]
+    header, _, first_row = data["text_output"].split("\n")[2:5]
+    assert header.count("Recipient's Timezone") == 2
+    assert first_row == (
+        "Wed, Mar 20 | 9:00 AM - 11:00 AM | 6:00 AM - 8:00 AM | 1:00 PM - 3:00 PM"
+    )
+
+    sample_request_data["recipient_timezone"] = None
+    sample_request_data["recipient_timezones"] = [
+        f"Etc/GMT+{i}" for i in range(settings.MAX_RECIPIENT_TIMEZONES + 1)
+    ]
+    response = client.post(
+        "/api/v1/availability",
+        json=sample_request_data,
+        headers={"X-API-Key": settings.API_KEY}
+    )
+    assert response.status_code == 400
+    assert "Too many recipient timezones" in response.json()["detail"]
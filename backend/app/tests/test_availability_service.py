@@ -2,7 +2,9 @@ from datetime import datetime, timedelta
 import pytz
 import pytest
 from app.schemas.availability import TimeSlot
-from app.services.availability_service import AvailabilityService
+from app.services.availability_service import AvailabilityService, block_cache
+from app.services.pagination import InvalidCursorError
+from app.services.timezone_engine import EPOCH
 
 @pytest.fixture
 def sample_time_slots():
@@ -85,4 +87,161 @@ def test_generate_chunks_output(sample_time_slots):
     
     # Should have multiple 30-minute chunks
     assert output.count("9:00 AM") > 0
-    assert output.count("9:30 AM") > 0 
\ No newline at end of file
+    assert output.count("9:30 AM") > 0 
+
+def test_normalize_slots_merges_overlapping_and_adjacent():
+    slots = [
+        TimeSlot(start="2024-03-20T10:00:00-04:00", end="2024-03-20T10:30:00-04:00"),
+        TimeSlot(start="2024-03-20T09:00:00-04:00", end="2024-03-20T09:30:00-04:00"),
+        TimeSlot(start="2024-03-20T09:30:00-04:00", end="2024-03-20T10:00:00-04:00"),
+        TimeSlot(start="2024-03-20T09:15:00-04:00", end="2024-03-20T09:45:00-04:00"),
+        TimeSlot(start="2024-03-20T14:00:00-04:00", end="2024-03-20T15:00:00-04:00"),
+    ]
+    starts, ends = AvailabilityService.normalize_slots(slots)
+    assert starts.typecode == "q"
+    assert list(zip(starts, ends)) == [
+        (1710939600, 1710945000),  # 9:00 AM - 10:30 AM EDT
+        (1710957600, 1710961200),  # 2:00 PM - 3:00 PM EDT
+    ]
+
+def test_continuous_output_merges_dragged_cells():
+    base = "2024-03-20T{}:00-04:00"
+    cells = ["09:00", "09:30", "10:00", "10:30"]
+    slots = [
+        TimeSlot(start=base.format(start), end=base.format(end))
+        for start, end in zip(cells, cells[1:])
+    ]
+    output = AvailabilityService.generate_continuous_output(slots, 'America/New_York')
+    assert output.split("\n")[4:] == ["Wed, Mar 20 | 9:00 AM - 10:30 AM"]
+
+def test_count_rows_matches_rendered_rows(sample_time_slots):
+    starts, ends = AvailabilityService.normalize_slots(sample_time_slots)
+    for granularity in (7, 15, 30, 60):
+        output = AvailabilityService.generate_chunks_output(
+            sample_time_slots, 'America/New_York', granularity_minutes=granularity
+        )
+        rows = len(output.split("\n")) - 4
+        assert AvailabilityService.count_rows(starts, ends, "chunks", granularity) == rows
+    assert AvailabilityService.count_rows(starts, ends, "continuous") == 2
+
+def test_chunks_pages_concatenate_to_full_output():
+    slots = [
+        TimeSlot(start="2024-03-09T22:00:00-05:00", end="2024-03-10T04:00:00-04:00"),
+        TimeSlot(start="2024-03-11T09:00:00-04:00", end="2024-03-11T09:20:00-04:00"),
+        TimeSlot(start="2024-03-12T09:00:00-04:00", end="2024-03-12T11:00:00-04:00"),
+    ]
+    full = AvailabilityService.generate_chunks_output(
+        slots, 'America/New_York', 'Asia/Tokyo', 15
+    ).split("\n")
+    header, rows = full[:4], full[4:]
+
+    paged_rows = []
+    cursor = None
+    while True:
+        text, cursor = AvailabilityService.generate_chunks_page(
+            slots, 'America/New_York', 'Asia/Tokyo', 15, limit=7, cursor=cursor
+        )
+        page = text.split("\n")
+        assert page[:4] == header
+        assert len(page[4:]) <= 7
+        paged_rows.extend(page[4:])
+        if cursor is None:
+            break
+    assert paged_rows == rows
+
+def test_chunks_page_rejects_foreign_cursor(sample_time_slots):
+    _, cursor = AvailabilityService.generate_chunks_page(
+        sample_time_slots, 'America/New_York', limit=1
+    )
+    with pytest.raises(InvalidCursorError):
+        AvailabilityService.generate_chunks_page(
+            sample_time_slots, 'Europe/London', limit=1, cursor=cursor
+        )
+    with pytest.raises(InvalidCursorError):
+        AvailabilityService.generate_chunks_page(
+            sample_time_slots, 'America/New_York', limit=1, cursor="not-a-cursor"
+        )
+
+def test_date_blocks_are_reused_across_calls():
+    block_cache.clear()
+    week = [
+        TimeSlot(start=f"2024-03-{day}T09:00:00-04:00", end=f"2024-03-{day}T12:00:00-04:00")
+        for day in range(18, 23)
+    ]
+    AvailabilityService.generate_output(week, 'America/New_York', None, "chunks", 15)
+    assert block_cache.stats()["misses"] == 5
+
+    # Changing one day re-renders only that day's block
+    week[2] = TimeSlot(start="2024-03-20T13:00:00-04:00", end="2024-03-20T15:00:00-04:00")
+    output = AvailabilityService.generate_output(week, 'America/New_York', None, "chunks", 15)
+    assert block_cache.stats()["misses"] == 6
+    assert "Wed, Mar 20 | 1:45 PM" in output
+
+def test_blocks_over_the_cell_bound_are_not_cached(monkeypatch):
+    block_cache.clear()
+    monkeypatch.setattr(block_cache, "max_weight", 5)
+    day = [TimeSlot(start="2024-03-18T09:00:00-04:00", end="2024-03-18T12:00:00-04:00")]
+    # Twelve 15-minute cells exceed the bound
+    AvailabilityService.generate_output(day, 'America/New_York', None, "chunks", 15)
+    assert block_cache.stats()["misses"] == 1
+    assert block_cache.stats()["size"] == 0
+
+@pytest.mark.parametrize("output_format", ["continuous", "chunks"])
+def test_block_and_streaming_rows_agree(output_format):
+    slots = [
+        TimeSlot(start="2024-11-02T22:00:00-04:00", end="2024-11-03T03:00:00-05:00"),
+        TimeSlot(start="2024-11-03T09:00:00-05:00", end="2024-11-03T10:10:00-05:00"),
+        TimeSlot(start="2024-11-04T23:30:00-05:00", end="2024-11-05T00:30:00-05:00"),
+    ]
+    args = ('America/New_York', 'Australia/Sydney', output_format, 20)
+    streamed = list(AvailabilityService.iter_output(slots, *args))
+    assert AvailabilityService.generate_output(slots, *args) == "\n".join(streamed)
+
+@pytest.mark.parametrize("output_format", ["continuous", "chunks"])
+def test_compact_output_matches_text_rows(output_format):
+    slots = [
+        TimeSlot(start="2024-11-02T22:00:00-04:00", end="2024-11-03T03:00:00-05:00"),
+        TimeSlot(start="2024-11-04T23:30:00-05:00", end="2024-11-05T00:30:00-05:00"),
+    ]
+    args = ('America/New_York', 'Australia/Sydney', output_format, 20)
+    starts, ends = AvailabilityService.normalize_slots(slots)
+    payload = AvailabilityService.build_compact_output(starts, ends, *args)
+    rows = AvailabilityService.render_rows(starts, ends, *args)
+
+    assert len(payload["date"]) == len(rows)
+    start = payload["base"]
+    offsets = payload["offsets"]
+    for i, row in enumerate(rows):
+        start += payload["start"][i]
+        user_start = EPOCH + timedelta(seconds=start + offsets[payload["user_start_offset"][i]])
+        recipient_start = EPOCH + timedelta(
+            seconds=start + offsets[payload["recipient_start_offset"][i]]
+        )
+        cells = row.split(" | ")
+        assert cells[0] == payload["dates"][payload["date"][i]]
+        assert cells[1].split(" - ")[0] == AvailabilityService.format_time(user_start)
+        assert cells[2].split(" - ")[0] == AvailabilityService.format_time(recipient_start)
+
+@pytest.mark.parametrize("output_format", ["continuous", "chunks"])
+def test_multiple_recipient_columns_match_single_zone_rows(output_format):
+    slots = [
+        TimeSlot(start="2024-11-02T22:00:00-04:00", end="2024-11-03T03:00:00-05:00"),
+        TimeSlot(start="2024-11-04T23:30:00-05:00", end="2024-11-05T00:30:00-05:00"),
+    ]
+    zones = ['Australia/Sydney', 'Asia/Kolkata']
+    output = AvailabilityService.generate_output(
+        slots, 'America/New_York', zones, output_format, 20
+    )
+    header, _, *rows = output.split("\n")[2:]
+    assert header.endswith(
+        "| Recipient's Timezone (Australia/Sydney) | Recipient's Timezone (Asia/Kolkata)"
+    )
+    per_zone = [
+        AvailabilityService.generate_output(
+            slots, 'America/New_York', zone, output_format, 20
+        ).split("\n")[4:]
+        for zone in zones
+    ]
+    for row, sydney, kolkata in zip(rows, *per_zone):
+        assert row == sydney + " | " + kolkata.split(" | ", 2)[2]
+    assert len(rows) == len(per_zone[0])
@@ -0,0 +1,31 @@
+from datetime import datetime, timedelta
+import pytz
+from app.services.availability_service import AvailabilityService
+from app.services.chunk_engine import chunk_count, chunk_rows
+from app.services.timezone_engine import get_zone_table, to_epoch
+
+def test_chunk_count_rounds_up_partial_chunks():
+    assert chunk_count(0, 3600, 1800) == 2
+    assert chunk_count(0, 3601, 1800) == 3
+    assert chunk_count(3600, 0, 1800) == 0
+
+def test_chunk_rows_match_per_row_formatting():
+    ny_tz = pytz.timezone('America/New_York')
+    start = ny_tz.localize(datetime(2024, 11, 2, 20, 0))
+    end = start + timedelta(hours=10)
+    rows = chunk_rows(
+        to_epoch(start), to_epoch(end), 15 * 60,
+        get_zone_table('America/New_York'), [get_zone_table('Asia/Kolkata')]
+    )
+
+    expected = []
+    current = start
+    while current < end:
+        recipient = current.astimezone(pytz.timezone('Asia/Kolkata'))
+        expected.append(
+            f"{AvailabilityService.format_date(current)} | "
+            f"{AvailabilityService.format_time(current)} | "
+            f"{AvailabilityService.format_time(recipient)}"
+        )
+        current += timedelta(minutes=15)
+    assert rows == expected
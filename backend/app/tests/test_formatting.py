@@ -0,0 +1,34 @@
+from datetime import datetime, timedelta
+import locale
+import pytest
+from app.services.formatting import TIME_LABELS, date_label, format_date, format_time
+
+def test_time_labels_cover_every_minute():
+    assert len(TIME_LABELS) == 1440
+    assert TIME_LABELS[0] == "12:00 AM"
+    assert TIME_LABELS[9 * 60] == "9:00 AM"
+    assert TIME_LABELS[12 * 60 + 30] == "12:30 PM"
+    assert TIME_LABELS[13 * 60 + 5] == "1:05 PM"
+
+def test_date_label():
+    day = (datetime(2024, 3, 20) - datetime(1970, 1, 1)).days
+    assert date_label(day) == "Wed, Mar 20"
+
+def test_labels_match_strftime_in_c_locale():
+    current = datetime(2024, 1, 1)
+    while current < datetime(2025, 1, 1):
+        assert format_time(current) == current.strftime("%I:%M %p").lstrip("0")
+        assert format_date(current) == current.strftime("%a, %b %d")
+        current += timedelta(minutes=97)
+
+def test_labels_ignore_process_locale():
+    previous = locale.setlocale(locale.LC_TIME)
+    try:
+        locale.setlocale(locale.LC_TIME, "de_DE.UTF-8")
+    except locale.Error:
+        pytest.skip("de_DE locale not available")
+    try:
+        assert format_date(datetime(2024, 3, 20, 9, 0)) == "Wed, Mar 20"
+        assert format_time(datetime(2024, 3, 20, 21, 0)) == "9:00 PM"
+    finally:
+        locale.setlocale(locale.LC_TIME, previous)
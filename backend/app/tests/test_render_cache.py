@@ -0,0 +1,63 @@
+from app.schemas.availability import TimeSlot
+from app.services.availability_service import AvailabilityService, render_cache
+from app.services.render_cache import RenderCache, make_cache_key
+
+def test_lru_eviction_and_counters():
+    cache = RenderCache(maxsize=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A"
+    cache.put("c", "C")  # evicts "b", the least recently used
+    assert cache.get("b") is None
+    assert cache.get("c") == "C"
+    assert cache.stats() == {
+        "size": 2, "maxsize": 2, "weight": 0, "max_weight": None,
+        "hits": 2, "misses": 1, "evictions": 1
+    }
+
+def test_weight_bound():
+    cache = RenderCache(maxsize=10, max_weight=10)
+    cache.put("a", "aaaa")
+    cache.put("b", "bbbb")
+    cache.put("c", "cccc")  # 12 characters: evicts "a"
+    assert cache.get("a") is None
+    assert cache.stats()["weight"] == 8
+    cache.put("big", "x" * 11)  # heavier than the whole cache: not stored
+    assert cache.get("big") is None
+    assert cache.get("b") == "bbbb" and cache.get("c") == "cccc"
+    cache.put("b", "bb")  # replacing an entry updates the total
+    assert cache.stats()["weight"] == 6
+
+def test_zero_size_disables_cache():
+    cache = RenderCache(maxsize=0)
+    cache.put("a", "A")
+    assert cache.get("a") is None
+
+def test_cache_key_is_canonical():
+    ny = [TimeSlot(start="2024-03-20T09:00:00-04:00", end="2024-03-20T10:00:00-04:00")]
+    utc = [TimeSlot(start="2024-03-20T13:00:00+00:00", end="2024-03-20T14:00:00+00:00")]
+    split = [
+        TimeSlot(start="2024-03-20T09:00:00-04:00", end="2024-03-20T09:30:00-04:00"),
+        TimeSlot(start="2024-03-20T09:30:00-04:00", end="2024-03-20T10:00:00-04:00"),
+    ]
+    ny = AvailabilityService.normalize_slots(ny)
+    key = make_cache_key(*ny, "America/New_York", None, "continuous", 30)
+    assert key == make_cache_key(
+        *AvailabilityService.normalize_slots(utc), "America/New_York", None, "continuous", 15
+    )
+    assert key == make_cache_key(
+        *AvailabilityService.normalize_slots(split), "America/New_York", None, "continuous", 30
+    )
+    assert key != make_cache_key(*ny, "America/Chicago", None, "continuous", 30)
+    assert key != make_cache_key(*ny, "America/New_York", None, "chunks", 30)
+
+def test_generate_output_hits_cache():
+    render_cache.clear()
+    slots = [TimeSlot(start="2024-03-20T09:00:00-04:00", end="2024-03-20T11:00:00-04:00")]
+    first = AvailabilityService.generate_output(slots, "America/New_York", "Europe/Paris", "chunks", 30)
+    second = AvailabilityService.generate_output(slots, "America/New_York", "Europe/Paris", "chunks", 30)
+    assert first == second
+    assert first == AvailabilityService.generate_chunks_output(
+        slots, "America/New_York", "Europe/Paris", 30
+    )
+    assert render_cache.stats()["hits"] == 1
@@ -0,0 +1,65 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.main import app
+from app.schemas.availability import TimeSlot
+from app.services.availability_service import AvailabilityService, render_cache, render_pool
+from app.services.render_pool import RenderPool, RenderPoolFull
+
+client = TestClient(app)
+
+def test_thread_pool_runs_and_counts():
+    pool = RenderPool("thread", max_workers=1, max_pending=4)
+    assert asyncio.run(pool.run(sum, [1, 2, 3])) == 6
+    stats = pool.stats()
+    assert stats["submitted"] == stats["completed"] == 1
+    assert stats["queue_depth"] == 0
+    pool.shutdown()
+
+def test_pool_rejects_when_full():
+    pool = RenderPool("thread", max_workers=1, max_pending=0)
+    with pytest.raises(RenderPoolFull):
+        asyncio.run(pool.run(sum, [1]))
+    assert pool.stats()["rejected"] == 1
+
+def test_process_pool_render_matches_inline():
+    slots = [TimeSlot(start="2024-03-09T00:00:00-05:00", end="2024-03-11T00:00:00-04:00")]
+    starts, ends = AvailabilityService.normalize_slots(slots)
+    args = (starts, ends, "America/New_York", "Europe/Berlin", "chunks", 15)
+    pool = RenderPool("process", max_workers=1)
+    try:
+        offloaded = asyncio.run(pool.run(AvailabilityService.render_text, *args))
+    finally:
+        pool.shutdown()
+    assert offloaded == AvailabilityService.render_text(*args)
+
+def test_large_requests_are_offloaded(monkeypatch):
+    monkeypatch.setattr(settings, "OFFLOAD_ROW_THRESHOLD", 10)
+    render_cache.clear()
+    submitted = render_pool.stats()["submitted"]
+    request = {
+        "selected_slots": [
+            {"start": "2024-03-20T09:00:00-04:00", "end": "2024-03-20T11:00:00-04:00"}
+        ],
+        "user_timezone": "America/New_York",
+        "output_format": "chunks",
+        "slot_granularity_minutes": 30,
+    }
+    headers = {"X-API-Key": settings.API_KEY}
+    # 4 rows stay inline
+    assert client.post("/api/v1/availability", json=request, headers=headers).status_code == 200
+    assert render_pool.stats()["submitted"] == submitted
+    # 24 rows go to the pool
+    request["slot_granularity_minutes"] = 5
+    response = client.post("/api/v1/availability", json=request, headers=headers)
+    assert response.status_code == 200
+    assert "10:55 AM" in response.json()["text_output"]
+    assert render_pool.stats()["submitted"] == submitted + 1
+
+def test_metrics_endpoint():
+    response = client.get("/api/v1/metrics")
+    assert response.status_code == 200
+    data = response.json()
+    assert {"queue_depth", "utilization", "busy_workers"} <= set(data["render_pool"])
+    assert {"hits", "misses", "evictions"} <= set(data["render_cache"])
@@ -0,0 +1,152 @@
+from array import array
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.main import app
+from app.schemas.availability import TimeSlot
+from app.services.availability_service import AvailabilityService, block_cache
+from app.services.session_store import SessionStore, session_store
+
+client = TestClient(app)
+
+def slot(day, start, end):
+    return TimeSlot(
+        start=f"2024-03-{day}T{start}:00-04:00", end=f"2024-03-{day}T{end}:00-04:00"
+    )
+
+def test_subtract_intervals():
+    starts, ends = array("q", [0, 100]), array("q", [50, 200])
+    remove_starts, remove_ends = array("q", [10, 40, 150]), array("q", [20, 120, 160])
+    assert AvailabilityService.subtract_intervals(starts, ends, remove_starts, remove_ends) == (
+        array("q", [0, 20, 120, 160]), array("q", [10, 40, 150, 200])
+    )
+
+def test_session_rerenders_only_touched_dates():
+    block_cache.clear()
+    store = SessionStore(max_sessions=10, idle_seconds=60)
+    session = store.create(user_timezone="America/New_York", recipient_timezone="Europe/Paris")
+    session.add_slots([slot("18", "09:00", "10:00"), slot("19", "09:00", "10:00"), slot("20", "09:00", "10:00")])
+    session.render()
+    # A user and a recipient column block per date
+    assert block_cache.stats()["misses"] == 6
+
+    session.add_slots([slot("19", "10:00", "11:00")])
+    text = session.render()
+    assert block_cache.stats()["misses"] == 8
+    assert "Tue, Mar 19 | 9:00 AM - 11:00 AM | 2:00 PM - 4:00 PM" in text
+
+    session.remove_slots([slot("20", "09:00", "09:30")])
+    text = session.render()
+    assert block_cache.stats()["misses"] == 10
+    assert "Wed, Mar 20 | 9:30 AM - 10:00 AM" in text
+
+    # The incremental result matches a full render of the same intervals
+    block_cache.clear()
+    assert text == AvailabilityService.render_text(
+        session.starts, session.ends, "America/New_York", "Europe/Paris"
+    )
+
+    # Only the recipient column is rendered when the recipient zone changes
+    session.configure(recipient_timezone="Asia/Tokyo")
+    session.render()
+    assert block_cache.stats()["misses"] == 6 + 3
+
+def test_session_store_bounds(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("app.services.session_store.time.monotonic", lambda: clock[0])
+    store = SessionStore(max_sessions=2, idle_seconds=60)
+    first = store.create(user_timezone="UTC")
+    store.create(user_timezone="UTC")
+    store.create(user_timezone="UTC")
+    assert store.get(first.session_id) is None
+    assert len(store) == 2
+
+    clock[0] += 61
+    assert len(store) == 2
+    assert store.get(first.session_id) is None
+    assert len(store) == 0
+    assert store.stats()["evictions"] == 3
+
+def test_session_endpoints():
+    headers = {"X-API-Key": settings.API_KEY}
+    response = client.post(
+        "/api/v1/availability/sessions/",
+        json={
+            "selected_slots": [
+                {"start": "2024-03-20T09:00:00-04:00", "end": "2024-03-20T10:00:00-04:00"}
+            ],
+            "user_timezone": "America/New_York",
+        },
+        headers=headers
+    )
+    assert response.status_code == 201
+    session_id = response.json()["session_id"]
+    url = f"/api/v1/availability/sessions/{session_id}"
+
+    response = client.patch(
+        url,
+        json={
+            "add_slots": [{"start": "2024-03-21T13:00:00-04:00", "end": "2024-03-21T14:00:00-04:00"}],
+            "recipient_timezone": "America/Los_Angeles",
+        },
+        headers=headers
+    )
+    assert response.status_code == 200
+    assert response.json()["recipient_timezone"] == "America/Los_Angeles"
+
+    text = client.get(url, headers=headers).json()["text_output"]
+    assert "Wed, Mar 20 | 9:00 AM - 10:00 AM | 6:00 AM - 7:00 AM" in text
+    assert "Thu, Mar 21 | 1:00 PM - 2:00 PM | 10:00 AM - 11:00 AM" in text
+
+    response = client.patch(url, json={"user_timezone": "Invalid/Timezone"}, headers=headers)
+    assert response.status_code == 400
+
+    assert client.delete(url, headers=headers).status_code == 204
+    assert client.get(url, headers=headers).status_code == 404
+
+def test_oversized_sessions_change_nothing(monkeypatch):
+    monkeypatch.setattr(settings, "MAX_OUTPUT_ROWS", 4)
+    # Renders every session on a worker thread
+    monkeypatch.setattr(settings, "OFFLOAD_ROW_THRESHOLD", 0)
+    headers = {"X-API-Key": settings.API_KEY}
+    body = {
+        "selected_slots": [
+            {"start": "2024-03-20T09:00:00-04:00", "end": "2024-03-20T10:00:00-04:00"}
+        ],
+        "user_timezone": "America/New_York",
+        "output_format": "chunks",
+        "slot_granularity_minutes": 10,
+    }
+    sessions = len(session_store)
+    response = client.post("/api/v1/availability/sessions/", json=body, headers=headers)
+    assert response.status_code == 400
+    assert len(session_store) == sessions
+
+    body["slot_granularity_minutes"] = 30
+    response = client.post("/api/v1/availability/sessions/", json=body, headers=headers)
+    assert response.status_code == 201
+    url = f"/api/v1/availability/sessions/{response.json()['session_id']}"
+    response = client.patch(
+        url,
+        json={
+            "add_slots": [{"start": "2024-03-21T09:00:00-04:00", "end": "2024-03-21T11:00:00-04:00"}],
+            "recipient_timezone": "Europe/Paris",
+        },
+        headers=headers
+    )
+    assert response.status_code == 400
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["recipient_timezone"] is None
+    assert "Thu, Mar 21" not in response.json()["text_output"]
+
+def test_create_session_rejects_unsupported_fields():
+    headers = {"X-API-Key": settings.API_KEY}
+    base = {
+        "selected_slots": [
+            {"start": "2024-03-20T09:00:00-04:00", "end": "2024-03-20T10:00:00-04:00"}
+        ],
+        "user_timezone": "America/New_York",
+    }
+    for extra in ({"recipient_timezones": ["Europe/Paris"]}, {"response_format": "columns"}):
+        response = client.post("/api/v1/availability/sessions/", json={**base, **extra}, headers=headers)
+        assert response.status_code == 400
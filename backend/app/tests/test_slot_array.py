@@ -0,0 +1,50 @@
+from array import array
+import tracemalloc
+import numpy as np
+from app.models.slot_array import SlotArray
+from app.schemas.availability import TimeSlot
+from app.services.availability_service import AvailabilityService
+
+SLOT_COUNT = 10_000
+
+def make_slots():
+    return [
+        TimeSlot(
+            start=f"2024-03-{1 + i // 48 % 28:02d}T{i // 2 % 24:02d}:{i % 2 * 30:02d}:00-04:00",
+            end=f"2024-03-{1 + i // 48 % 28:02d}T{i // 2 % 24:02d}:{i % 2 * 30 + 15:02d}:00-04:00",
+        )
+        for i in range(SLOT_COUNT)
+    ]
+
+def allocated_bytes(build):
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        return tracemalloc.get_traced_memory()[0] - before, result
+    finally:
+        tracemalloc.stop()
+
+def test_per_slot_memory():
+    slots = make_slots()
+    slot_array_bytes, _ = allocated_bytes(lambda: AvailabilityService.slot_epochs(slots))
+    time_slot_bytes, _ = allocated_bytes(make_slots)
+    per_slot = slot_array_bytes / SLOT_COUNT
+    # Two int64 columns, plus slack for array growth
+    assert per_slot <= 20, f"SlotArray uses {per_slot:.1f} B/slot"
+    assert time_slot_bytes > 10 * slot_array_bytes, (
+        f"TimeSlot uses {time_slot_bytes / SLOT_COUNT:.1f} B/slot"
+    )
+
+def test_take_and_numpy_round_trip():
+    intervals = SlotArray(array("q", [30, 10, 20]), array("q", [40, 15, 25]))
+    ordered = intervals.take(np.argsort(intervals.as_numpy()[0]))
+    assert ordered == (array("q", [10, 20, 30]), array("q", [15, 25, 40]))
+    assert ordered.size == 3
+    assert SlotArray.empty().size == 0
+
+def test_merge_intervals_accepts_slot_array():
+    intervals = SlotArray(array("q", [50, 0, 10, 30]), array("q", [60, 10, 20, 40]))
+    assert AvailabilityService.merge_intervals(intervals) == (
+        array("q", [0, 30, 50]), array("q", [20, 40, 60])
+    )
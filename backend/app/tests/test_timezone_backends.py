@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+import numpy as np
+import pytz
+import pytest
+from app.core.config import settings
+from app.main import app
+from app.schemas.availability import TimeSlot
+from app.services.availability_service import AvailabilityService, block_cache
+from app.services.timezone_backends import BACKENDS, get_zone_converter
+from app.services.timezone_engine import ZoneConverter, get_zone_table, to_epoch
+
+ZONES = [
+    "America/New_York",
+    "Europe/London",
+    "Europe/Dublin",
+    "Australia/Sydney",
+    "Australia/Lord_Howe",
+    "America/Santiago",
+    "Asia/Kolkata",
+    "Etc/GMT+5",
+    "UTC",
+]
+
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+@pytest.mark.parametrize("zone_name", ZONES)
+def test_backends_agree_across_dst(backend, zone_name):
+    converter = get_zone_converter(zone_name, backend)
+    table = get_zone_table(zone_name)
+    start, end = to_epoch(datetime(2020, 1, 1)), to_epoch(datetime(2027, 1, 1))
+    # Every transition, a second either side, plus a coarse walk between them
+    transitions = np.array([t for t in table.transitions if start <= t < end], dtype=np.int64)
+    epochs = np.concatenate([
+        transitions - 1, transitions, transitions + 1,
+        np.arange(start, end, 7 * 3600 + 15 * 60, dtype=np.int64),
+    ])
+    assert (converter.to_local_array(epochs) == table.to_local_array(epochs)).all()
+
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+@pytest.mark.parametrize("zone_name", ["America/New_York", "Australia/Sydney", "Europe/Dublin"])
+def test_localize_matches_pytz_at_transitions(backend, zone_name):
+    zone = pytz.timezone(zone_name)
+    converter = get_zone_converter(zone_name, backend)
+    for transition in get_zone_table(zone_name).transitions:
+        if not to_epoch(datetime(2023, 1, 1)) <= transition < to_epoch(datetime(2025, 1, 1)):
+            continue
+        # Wall-clock times around the transition, including the skipped or
+        # repeated hour
+        wall = (datetime(1970, 1, 1) + timedelta(seconds=converter.to_local(transition)))
+        for minutes in range(-90, 91, 15):
+            naive = wall + timedelta(minutes=minutes)
+            expected = to_epoch(zone.localize(naive, is_dst=False))
+            assert converter.localize(naive) == expected, naive
+
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+def test_rendered_output_is_backend_independent(backend, monkeypatch):
+    slots = [
+        TimeSlot(start="2024-11-02T22:00:00-04:00", end="2024-11-03T03:00:00-05:00"),
+        TimeSlot(start="2024-03-09T23:00:00-05:00", end="2024-03-10T04:00:00-04:00"),
+    ]
+    starts, ends = AvailabilityService.normalize_slots(slots)
+    args = ("America/New_York", ["Australia/Sydney", "Europe/London"], "chunks", 20)
+    monkeypatch.setattr(block_cache, "maxsize", 0)
+    expected = AvailabilityService.render_text(starts, ends, *args)
+    monkeypatch.setattr(settings, "TIMEZONE_BACKEND", backend)
+    assert AvailabilityService.render_text(starts, ends, *args) == expected
+    converted = AvailabilityService.convert_timezone(
+        datetime(2024, 11, 3, 1, 30), "America/New_York", "Europe/London"
+    )
+    assert converted.replace(tzinfo=None) == datetime(2024, 11, 3, 6, 30)
+
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+def test_zone_names_are_case_insensitive(backend, monkeypatch):
+    converter = get_zone_converter("america/new_york", backend)
+    assert converter is get_zone_converter("America/New_York", backend)
+
+    monkeypatch.setattr(settings, "TIMEZONE_BACKEND", backend)
+    response = TestClient(app).post(
+        "/api/v1/availability",
+        json={
+            "selected_slots": [
+                {"start": "2024-03-20T09:00:00-04:00", "end": "2024-03-20T10:00:00-04:00"}
+            ],
+            "user_timezone": "america/new_york",
+            "recipient_timezone": "EUROPE/LONDON",
+        },
+        headers={"X-API-Key": settings.API_KEY}
+    )
+    assert response.status_code == 200
+    assert "Wed, Mar 20 | 9:00 AM - 10:00 AM | 1:00 PM - 2:00 PM" in response.json()["text_output"]
+
+def test_unknown_backend_and_zone():
+    with pytest.raises(ValueError):
+        get_zone_converter("UTC", "dateutil")
+    for backend in BACKENDS:
+        with pytest.raises(pytz.exceptions.UnknownTimeZoneError):
+            get_zone_converter("Invalid/Timezone", backend)
+
+def test_incomplete_backend_fails_on_construction():
+    class OffsetOnly(ZoneConverter):
+        def offset_at(self, epoch):
+            return 0
+
+    with pytest.raises(TypeError):
+        OffsetOnly()
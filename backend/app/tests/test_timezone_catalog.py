@@ -0,0 +1,58 @@
+import json
+from datetime import datetime, timezone
+from fastapi.testclient import TestClient
+import pytz
+from app.main import app
+from app.services.timezone_catalog import (
+    ALIASES,
+    CANONICAL_ZONES,
+    ZONE_NAMES,
+    build_catalog,
+    is_known_zone,
+    zone_abbreviation,
+)
+
+client = TestClient(app)
+
+def epoch(*args):
+    return int(datetime(*args, tzinfo=timezone.utc).timestamp())
+
+def test_zone_names_match_pytz():
+    assert ZONE_NAMES == set(pytz.all_timezones)
+    assert set(CANONICAL_ZONES) | set(ALIASES) == ZONE_NAMES
+    assert ALIASES["US/Pacific"] == "America/Los_Angeles"
+    assert ALIASES["Asia/Calcutta"] == "Asia/Kolkata"
+    assert is_known_zone("america/new_york")
+    assert not is_known_zone("Invalid/Timezone")
+
+def test_abbreviations():
+    summer, winter = epoch(2024, 7, 1), epoch(2024, 1, 1)
+    assert zone_abbreviation("America/Los_Angeles", summer) == "PDT"
+    assert zone_abbreviation("America/New_York", summer) == "EDT"
+    assert zone_abbreviation("America/New_York", winter) == "EST"
+
+def test_catalog_expires_at_next_transition():
+    now = epoch(2024, 3, 1)
+    catalog = build_catalog(now)
+    data = json.loads(catalog.body)
+    new_york = next(zone for zone in data["zones"] if zone["name"] == "America/New_York")
+    assert new_york["offset"] == -5 * 3600
+    assert new_york["abbreviation"] == "EST"
+    assert "US/Eastern" in new_york["aliases"]
+    # Some zone changes offset before New York does on March 10
+    assert now < catalog.valid_until <= epoch(2024, 3, 10, 7)
+    assert catalog.covers(catalog.valid_until - 1)
+    assert not catalog.covers(catalog.valid_until)
+    # Built later but before the transition: same body and ETag
+    assert build_catalog(catalog.valid_until - 1).etag == catalog.etag
+
+def test_timezones_endpoint():
+    response = client.get("/api/v1/timezones")
+    assert response.status_code == 200
+    names = {zone["name"] for zone in response.json()["zones"]}
+    assert "Europe/London" in names
+    assert "GB" not in names
+
+    etag = response.headers["etag"]
+    response = client.get("/api/v1/timezones", headers={"If-None-Match": etag})
+    assert response.status_code == 304
@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta
+import pytz
+import pytest
+from app.schemas.availability import TimeSlot
+from app.services.availability_service import AvailabilityService
+from app.services.timezone_engine import EPOCH, get_zone_table, to_epoch
+
+@pytest.mark.parametrize("zone_name", [
+    "America/New_York",
+    "Europe/London",
+    "Australia/Lord_Howe",
+    "Asia/Kolkata",
+    "Etc/GMT+5",
+    "UTC",
+])
+def test_to_local_matches_pytz_across_dst(zone_name):
+    zone = pytz.timezone(zone_name)
+    table = get_zone_table(zone_name)
+    # Walk a year in 15-minute steps so every DST transition is crossed
+    start = pytz.utc.localize(datetime(2024, 1, 1))
+    for step in range(0, 366 * 24 * 4, 7):
+        instant = start + timedelta(minutes=15 * step)
+        expected = instant.astimezone(zone).replace(tzinfo=None)
+        assert EPOCH + timedelta(seconds=table.to_local(to_epoch(instant))) == expected
+
+def test_to_epoch_reads_naive_as_utc():
+    naive = datetime(2024, 3, 20, 13, 0)
+    assert to_epoch(naive) == to_epoch(pytz.utc.localize(naive))
+
+def test_get_zone_table_is_cached():
+    assert get_zone_table("America/New_York") is get_zone_table("America/New_York")
+
+def test_zone_caches_are_keyed_on_canonical_names():
+    table = get_zone_table("America/New_York")
+    for variant in ("america/new_york", "AMERICA/NEW_YORK", "America/New_york"):
+        assert get_zone_table(variant) is table
+    assert table.name == "America/New_York"
+
+def test_unknown_zone_raises():
+    with pytest.raises(pytz.exceptions.UnknownTimeZoneError):
+        get_zone_table("Invalid/Timezone")
+
+def test_continuous_output_across_fall_back():
+    # 12:30 AM EDT to 3:00 AM EST on the night clocks fall back
+    slots = [TimeSlot(start="2024-11-03T00:30:00-04:00", end="2024-11-03T03:00:00-05:00")]
+    output = AvailabilityService.generate_continuous_output(
+        slots, "America/New_York", "America/Los_Angeles"
+    )
+    assert output.split("\n")[-1] == "Sun, Nov 03 | 12:30 AM - 3:00 AM | 9:30 PM - 1:00 AM"
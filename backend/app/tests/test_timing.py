@@ -0,0 +1,132 @@
+import asyncio
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.core import timing
+from app.core.profiling import StackProfiler
+from app.core.timing import Histogram, RequestTiming, row_bucket, stage, stage_duration
+from app.main import app
+
+client = TestClient(app)
+
+def test_row_bucket():
+    assert row_bucket(0) == "<=10"
+    assert row_bucket(10) == "<=10"
+    assert row_bucket(11) == "<=100"
+    assert row_bucket(10_001) == ">10000"
+
+def test_nested_stages_do_not_overlap(monkeypatch):
+    clock = iter([0.0, 1.0, 3.0, 4.0])
+    monkeypatch.setattr(timing, "perf_counter", lambda: next(clock))
+    record = RequestTiming()
+    token = timing._current_timing.set(record)
+    try:
+        with stage("render"):
+            with stage("convert"):
+                pass
+    finally:
+        timing._current_timing.reset(token)
+    assert record.stages == {"render": 2.0, "convert": 2.0}
+
+def test_histogram_render():
+    histogram = Histogram("test_seconds", "Test.", ("stage",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, ("parse",))
+    histogram.observe(0.5, ("parse",))
+    histogram.observe(5.0, ("parse",))
+    assert histogram.render() == [
+        "# HELP test_seconds Test.",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{stage="parse",le="0.1"} 1',
+        'test_seconds_bucket{stage="parse",le="1.0"} 2',
+        'test_seconds_bucket{stage="parse",le="+Inf"} 3',
+        'test_seconds_sum{stage="parse"} 5.55',
+        'test_seconds_count{stage="parse"} 3',
+    ]
+
+def test_stage_metrics_exported():
+    payload = {
+        "selected_slots": [
+            {"start": "2024-03-20T09:00:00-04:00", "end": "2024-03-20T11:00:00-04:00"}
+        ],
+        "user_timezone": "America/New_York",
+        "recipient_timezone": "Asia/Tokyo",
+        "output_format": "chunks",
+        "slot_granularity_minutes": 60,
+    }
+    stages = ("parse", "validate", "convert", "render", "serialize")
+    before = {name: stage_duration.count((name, "chunks", "<=10")) for name in stages}
+    response = client.post(
+        "/api/v1/availability", json=payload, headers={"X-API-Key": settings.API_KEY}
+    )
+    assert response.status_code == 200
+    for name in stages:
+        assert stage_duration.count((name, "chunks", "<=10")) == before[name] + 1
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert (
+        'timetext_stage_duration_seconds_count{stage="render",output_format="chunks",rows="<=10"}'
+        in response.text
+    )
+    assert "# TYPE timetext_request_duration_seconds histogram" in response.text
+    assert "# TYPE timetext_render_pool_queue_depth gauge" in response.text
+    assert 'timetext_cache_size{cache="block"} ' in response.text
+    assert 'timetext_cache_hits_total{cache="render"} ' in response.text
+
+def test_profiled_request(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "DEBUG", True)
+    monkeypatch.setattr(settings, "PROFILE_DIR", str(tmp_path))
+    payload = {
+        "selected_slots": [
+            {"start": "2024-03-21T09:00:00-04:00", "end": "2024-03-21T17:00:00-04:00"}
+        ],
+        "user_timezone": "America/New_York",
+        "output_format": "chunks",
+        "slot_granularity_minutes": 5,
+    }
+    response = client.post(
+        "/api/v1/availability",
+        json=payload,
+        headers={"X-API-Key": settings.API_KEY, "X-Profile": "1"}
+    )
+    assert response.status_code == 200
+    timing = response.headers["server-timing"]
+    assert "parse;dur=" in timing and "render;dur=" in timing and "total;dur=" in timing
+    profile = (tmp_path / response.headers["x-profile-file"].rsplit("/", 1)[-1]).read_text()
+    assert "render_text" in profile
+    stack, weight = profile.splitlines()[0].rsplit(" ", 1)
+    assert int(weight) >= 0
+
+    # Ignored unless DEBUG is on
+    monkeypatch.setattr(settings, "DEBUG", False)
+    response = client.post(
+        "/api/v1/availability",
+        json=payload,
+        headers={"X-API-Key": settings.API_KEY, "X-Profile": "1"}
+    )
+    assert "server-timing" not in response.headers
+
+def test_profiler_ignores_other_tasks():
+    def profiled_work():
+        return sum(range(1000))
+
+    def other_work():
+        return sum(range(1000))
+
+    async def other_task():
+        other_work()
+
+    async def profiled_task():
+        profiler = StackProfiler()
+        profiler.start()
+        try:
+            profiled_work()
+            await asyncio.gather(other_task())
+            profiled_work()
+        finally:
+            profiler.stop()
+        return profiler.collapsed()
+
+    profile = asyncio.run(profiled_task())
+    assert "profiled_work" in profile
+    assert "other_work" not in profile
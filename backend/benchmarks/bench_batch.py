@@ -0,0 +1,70 @@
+"""Throughput of the batch endpoint against one request per person.
+
+Each simulated person has their own week of availability, so no two items
+share a render cache entry. The render cache is disabled while measuring.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_batch
+"""
+import json
+import logging
+import time
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.main import app
+from app.services.availability_service import block_cache, render_cache
+
+BATCH_SIZES = [10, 50, 100]
+ROUNDS = 5
+ZONES = ["America/New_York", "America/Los_Angeles", "Europe/London", "Asia/Kolkata"]
+
+
+def make_item(person: int) -> dict:
+    base = datetime(2024, 3, 18, 8, 0) + timedelta(minutes=15 * person)
+    slots = []
+    for day in range(5):
+        start = base + timedelta(days=day)
+        slots.append({
+            "start": f"{start.isoformat()}-04:00",
+            "end": f"{(start + timedelta(hours=3)).isoformat()}-04:00",
+        })
+    return {
+        "selected_slots": slots,
+        "user_timezone": "America/New_York",
+        "recipient_timezone": ZONES[person % len(ZONES)],
+        "output_format": "chunks" if person % 2 else "continuous",
+        "slot_granularity_minutes": 15,
+    }
+
+
+def items_per_second(client: TestClient, items: list, batched: bool) -> float:
+    headers = {"Content-Type": "application/json", "X-API-Key": settings.API_KEY}
+    if batched:
+        payloads = [("/api/v1/availability/batch", json.dumps({"items": items}))]
+    else:
+        payloads = [("/api/v1/availability/", json.dumps(item)) for item in items]
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        for url, payload in payloads:
+            client.post(url, content=payload, headers=headers).raise_for_status()
+    return ROUNDS * len(items) / (time.perf_counter() - started)
+
+
+def main():
+    logging.getLogger().setLevel(logging.WARNING)
+    render_cache.maxsize = 0
+    block_cache.maxsize = 0
+    client = TestClient(app)
+    print(f"{'items':>6} | {'single items/s':>14} | {'batch items/s':>13} | {'speedup':>7}")
+    for batch_size in BATCH_SIZES:
+        items = [make_item(person) for person in range(batch_size)]
+        items_per_second(client, items[:2], batched=True)  # warm up
+        single = items_per_second(client, items, batched=False)
+        batched = items_per_second(client, items, batched=True)
+        print(f"{batch_size:>6} | {single:>14.1f} | {batched:>13.1f} | {batched / single:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
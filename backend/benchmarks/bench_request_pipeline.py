@@ -0,0 +1,107 @@
+"""Requests/sec of the availability request pipeline, before and after.
+
+The legacy pipeline decoded the body with ``request.json()``, built the model
+from the resulting dict and logged the whole payload. The current pipeline
+validates the raw bytes once and logs a one-line summary. Both are mounted on
+a throwaway app so only body handling is measured, then the full endpoint is
+measured as well.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_request_pipeline
+"""
+import json
+import logging
+import time
+from datetime import datetime, timedelta
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+from app.api.v1.endpoints.availability import get_request_body
+from app.core.config import settings
+from app.main import app
+from app.schemas.availability import AvailabilityRequest
+
+SLOT_COUNTS = [10, 1_000, 10_000]
+# Roughly the same wall-clock budget per payload size
+ITERATIONS = {10: 2_000, 1_000: 100, 10_000: 10}
+
+logger = logging.getLogger("benchmarks.request_pipeline")
+logger.addHandler(logging.NullHandler())
+logger.propagate = False
+
+
+async def legacy_get_request_body(request: Request) -> AvailabilityRequest:
+    try:
+        body = await request.json()
+        return AvailabilityRequest(**body)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid request body: {str(e)}")
+
+
+bench_app = FastAPI()
+
+
+@bench_app.post("/legacy")
+async def legacy(request: Request, body: AvailabilityRequest = Depends(legacy_get_request_body)):
+    logger.info(f"Received request: {await request.json()}")
+    return {"slots": len(body.selected_slots)}
+
+
+@bench_app.post("/current")
+async def current(body: AvailabilityRequest = Depends(get_request_body)):
+    logger.info(
+        "Received request: %d slots, %s -> %s, format=%s",
+        len(body.selected_slots),
+        body.user_timezone,
+        body.recipient_timezone,
+        body.output_format
+    )
+    return {"slots": len(body.selected_slots)}
+
+
+def make_payload(slot_count: int) -> bytes:
+    base = datetime(2024, 3, 20, 9, 0)
+    slots = []
+    for i in range(slot_count):
+        start = base + timedelta(minutes=30 * i)
+        slots.append({
+            "start": f"{start.isoformat()}-04:00",
+            "end": f"{(start + timedelta(minutes=30)).isoformat()}-04:00",
+        })
+    return json.dumps({
+        "selected_slots": slots,
+        "user_timezone": "America/New_York",
+        "recipient_timezone": "America/Los_Angeles",
+        "output_format": "continuous",
+    }).encode()
+
+
+def requests_per_second(client: TestClient, url: str, payload: bytes, iterations: int) -> float:
+    headers = {"Content-Type": "application/json", "X-API-Key": settings.API_KEY}
+    client.post(url, content=payload, headers=headers).raise_for_status()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        client.post(url, content=payload, headers=headers)
+    return iterations / (time.perf_counter() - started)
+
+
+def main():
+    logging.getLogger().setLevel(logging.WARNING)
+    logger.setLevel(logging.INFO)
+    bench_client = TestClient(bench_app)
+    app_client = TestClient(app)
+    print(f"{'slots':>8} | {'legacy req/s':>13} | {'current req/s':>13} | {'speedup':>7} | {'endpoint req/s':>14}")
+    for slot_count in SLOT_COUNTS:
+        payload = make_payload(slot_count)
+        iterations = ITERATIONS[slot_count]
+        legacy_rps = requests_per_second(bench_client, "/legacy", payload, iterations)
+        current_rps = requests_per_second(bench_client, "/current", payload, iterations)
+        endpoint_rps = requests_per_second(app_client, "/api/v1/availability/", payload, iterations)
+        print(
+            f"{slot_count:>8} | {legacy_rps:>13.1f} | {current_rps:>13.1f} | "
+            f"{current_rps / legacy_rps:>6.2f}x | {endpoint_rps:>14.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
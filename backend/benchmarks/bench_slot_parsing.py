@@ -0,0 +1,83 @@
+"""Slot parsing and normalization throughput on large payloads, before and after.
+
+The legacy schema declared ``str`` fields and ran ``datetime.fromisoformat``
+in a Python-level validator for every field. The current schema lets
+pydantic-core parse the datetimes natively, and the service decodes each
+slot to UTC epoch seconds once. Both paths go from raw JSON bytes to the
+normalized interval columns.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_slot_parsing
+"""
+import json
+import time
+from datetime import datetime, timedelta
+from typing import List
+from pydantic import BaseModel, Field, field_validator
+from app.schemas.availability import AvailabilityRequest
+from app.services.availability_service import AvailabilityService
+
+SLOT_COUNTS = [1_000, 10_000, 50_000]
+ITERATIONS = {1_000: 200, 10_000: 20, 50_000: 4}
+
+
+class LegacyTimeSlot(BaseModel):
+    start: str = Field(...)
+    end: str = Field(...)
+
+    @field_validator('start', 'end')
+    @classmethod
+    def validate_datetime(cls, v: str) -> datetime:
+        try:
+            return datetime.fromisoformat(v)
+        except ValueError:
+            raise ValueError("Invalid datetime format. Must be in ISO format.")
+
+
+class LegacyAvailabilityRequest(BaseModel):
+    selected_slots: List[LegacyTimeSlot]
+    user_timezone: str
+    recipient_timezone: str = None
+    output_format: str = "continuous"
+
+
+def make_payload(slot_count: int) -> bytes:
+    base = datetime(2024, 3, 20, 9, 0)
+    slots = []
+    for i in range(slot_count):
+        start = base + timedelta(minutes=45 * i)
+        slots.append({
+            "start": f"{start.isoformat()}-04:00",
+            "end": f"{(start + timedelta(minutes=30)).isoformat()}-04:00",
+        })
+    return json.dumps({
+        "selected_slots": slots,
+        "user_timezone": "America/New_York",
+        "recipient_timezone": "America/Los_Angeles",
+    }).encode()
+
+
+def seconds_per_payload(model, payload: bytes, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        body = model.model_validate_json(payload)
+        AvailabilityService.normalize_slots(body.selected_slots)
+    return (time.perf_counter() - started) / iterations
+
+
+def main():
+    print(f"{'slots':>8} | {'legacy ms':>10} | {'current ms':>10} | {'speedup':>7} | {'current us/slot':>15}")
+    for slot_count in SLOT_COUNTS:
+        payload = make_payload(slot_count)
+        iterations = ITERATIONS[slot_count]
+        legacy = seconds_per_payload(LegacyAvailabilityRequest, payload, iterations)
+        current = seconds_per_payload(AvailabilityRequest, payload, iterations)
+        print(
+            f"{slot_count:>8} | {legacy * 1000:>10.2f} | {current * 1000:>10.2f} | "
+            f"{legacy / current:>6.2f}x | {current * 1e6 / slot_count:>15.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
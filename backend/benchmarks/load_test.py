@@ -0,0 +1,227 @@
+"""Load test against a locally launched uvicorn server, or any base URL.
+
+Concurrent async clients send a weighted mix of request kinds (output format
+and payload size) over a set of zone pairs, and the run reports latency
+percentiles, throughput and error rates per kind and overall. Each request
+shifts its slots by a few minutes so the render cache does not serve repeats;
+pass ``--repeat-payloads`` to measure the cached path instead.
+
+Run from the backend directory:
+
+    python -m benchmarks.load_test --workers 2 --concurrency 32 --duration 20
+    python -m benchmarks.load_test --mix continuous-small:3,chunks-large:1
+    python -m benchmarks.load_test --url https://example.com/api/v1 --api-key ...
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+import httpx
+import numpy as np
+from app.core.config import settings
+
+# Slots per payload for each size
+SIZES = {"small": 5, "medium": 100, "large": 1_000}
+DEFAULT_MIX = "continuous-small:4,continuous-medium:2,chunks-small:2,chunks-medium:1,chunks-large:1"
+DEFAULT_ZONES = (
+    "America/New_York>America/Los_Angeles,"
+    "Europe/London>Asia/Kolkata,"
+    "Australia/Sydney>America/Chicago,"
+    "Asia/Tokyo>"
+)
+BASE_TIME = datetime(2024, 10, 28, 13, 0, tzinfo=timezone.utc)
+
+
+def parse_mix(spec: str) -> List[Tuple[str, str, int]]:
+    mix = []
+    for item in spec.split(","):
+        kind, _, weight = item.partition(":")
+        output_format, _, size = kind.partition("-")
+        if output_format not in ("continuous", "chunks") or size not in SIZES:
+            raise argparse.ArgumentTypeError(f"Unknown request kind: {kind}")
+        mix.append((output_format, size, int(weight or 1)))
+    return mix
+
+
+def parse_zones(spec: str) -> List[Tuple[str, Optional[str]]]:
+    pairs = []
+    for item in spec.split(","):
+        user_tz, _, recipient_tz = item.partition(">")
+        pairs.append((user_tz, recipient_tz or None))
+    return pairs
+
+
+def make_payload(
+    output_format: str,
+    size: str,
+    zones: Tuple[str, Optional[str]],
+    shift_minutes: int
+) -> bytes:
+    base = BASE_TIME + timedelta(minutes=shift_minutes)
+    slots = []
+    for i in range(SIZES[size]):
+        start = base + timedelta(hours=3 * i)
+        slots.append({
+            "start": start.isoformat(),
+            "end": (start + timedelta(hours=2)).isoformat(),
+        })
+    return json.dumps({
+        "selected_slots": slots,
+        "user_timezone": zones[0],
+        "recipient_timezone": zones[1],
+        "output_format": output_format,
+        "slot_granularity_minutes": 15,
+    }).encode()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, workers: int, show_logs: bool) -> subprocess.Popen:
+    env = {**os.environ, "PYTHONUNBUFFERED": "1"}
+    # The app logs every request at INFO, which would drown the report
+    output = None if show_logs else subprocess.DEVNULL
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning", "--no-access-log",
+        ],
+        env=env,
+        stdout=output,
+        stderr=output,
+    )
+
+
+async def wait_until_ready(base_url: str, timeout: float = 30.0) -> None:
+    root = base_url.rsplit("/api/", 1)[0] + "/"
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(root)).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {root} did not become ready within {timeout:.0f}s")
+
+
+async def run_load(args: argparse.Namespace, base_url: str) -> Dict[str, Dict[str, list]]:
+    mix = parse_mix(args.mix)
+    zones = parse_zones(args.zones)
+    kinds = [(output_format, size) for output_format, size, _ in mix]
+    weights = [weight for _, _, weight in mix]
+    rng = random.Random(args.seed)
+    counter = itertools.count()
+    results: Dict[str, Dict[str, list]] = defaultdict(lambda: {"latencies": [], "errors": []})
+    headers = {"Content-Type": "application/json", "X-API-Key": args.api_key}
+    url = f"{base_url}/availability/"
+    deadline = time.monotonic() + args.duration
+
+    async def client_loop(client: httpx.AsyncClient) -> None:
+        while time.monotonic() < deadline:
+            index = next(counter)
+            if args.requests and index >= args.requests:
+                return
+            output_format, size = rng.choices(kinds, weights)[0]
+            shift = 0 if args.repeat_payloads else index % 10_000
+            payload = make_payload(output_format, size, zones[index % len(zones)], shift)
+            kind = f"{output_format}-{size}"
+            started = time.perf_counter()
+            try:
+                response = await client.post(url, content=payload, headers=headers)
+                status = response.status_code
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            elapsed = time.perf_counter() - started
+            if status == 200:
+                results[kind]["latencies"].append(elapsed)
+            else:
+                results[kind]["errors"].append(status)
+
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+        await asyncio.gather(*(client_loop(client) for _ in range(args.concurrency)))
+    return results
+
+
+def report(results: Dict[str, Dict[str, list]], elapsed: float) -> None:
+    print(f"{'kind':<18} {'ok':>7} {'errors':>7} {'err %':>6} {'req/s':>8} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    rows = sorted(results.items())
+    total = {
+        "latencies": [t for _, kind in rows for t in kind["latencies"]],
+        "errors": [e for _, kind in rows for e in kind["errors"]],
+    }
+    for name, kind in rows + [("total", total)]:
+        ok = len(kind["latencies"])
+        errors = len(kind["errors"])
+        if ok:
+            p50, p95, p99 = np.percentile(kind["latencies"], [50, 95, 99]) * 1000
+        else:
+            p50 = p95 = p99 = float("nan")
+        print(
+            f"{name:<18} {ok:>7} {errors:>7} {100 * errors / max(ok + errors, 1):>5.1f}% "
+            f"{(ok + errors) / elapsed:>8.1f} {p50:>8.1f} {p95:>8.1f} {p99:>8.1f}"
+        )
+    statuses = defaultdict(int)
+    for error in total["errors"]:
+        statuses[error] += 1
+    if statuses:
+        print("errors by status: " + ", ".join(f"{k}={v}" for k, v in sorted(statuses.items(), key=str)))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--url", help="Base API URL of a running server; by default a local uvicorn is launched")
+    parser.add_argument("--api-key", default=settings.API_KEY, help="Defaults to the local settings' key")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes for the local server")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to generate load")
+    parser.add_argument("--requests", type=int, default=0, help="Stop after this many requests (0: no limit)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Weighted kinds, e.g. continuous-small:3,chunks-large:1")
+    parser.add_argument("--zones", default=DEFAULT_ZONES, help="Zone pairs as user>recipient, comma separated")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--repeat-payloads", action="store_true", help="Send identical payloads per kind")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--show-server-logs", action="store_true", help="Pass the local server's logs through")
+    args = parser.parse_args()
+    parse_mix(args.mix)
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        port = free_port()
+        server = start_server(port, args.workers, args.show_server_logs)
+        base_url = f"http://127.0.0.1:{port}/api/v1"
+    try:
+        asyncio.run(wait_until_ready(base_url))
+        print(
+            f"Load: {args.concurrency} clients for {args.duration:.0f}s against {base_url}"
+            + (f" ({args.workers} workers)" if server else "")
+        )
+        started = time.perf_counter()
+        results = asyncio.run(run_load(args, base_url))
+        report(results, time.perf_counter() - started)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
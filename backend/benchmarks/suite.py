@@ -0,0 +1,260 @@
+"""Reproducible benchmark suite with JSON results for comparing commits.
+
+Covers ``convert_timezone``, both output generators and the full endpoint
+through ``TestClient``, across slot counts, chunk granularities and date
+ranges with and without a DST transition, plus each timezone backend on bulk
+conversion, ``localize`` and a chunks render. The render and block caches are
+disabled so every call does the full work.
+
+Run from the backend directory:
+
+    python -m benchmarks.suite run                      # writes benchmarks/results/<commit>.json
+    python -m benchmarks.suite run --filter chunks --output head.json
+    python -m benchmarks.suite compare base.json head.json
+
+``compare`` exits with status 1 when any benchmark is slower than the base
+by more than ``--threshold`` (default 1.10, i.e. 10%).
+"""
+import argparse
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, NamedTuple
+import numpy as np
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.main import app
+from app.schemas.availability import TimeSlot
+from app.services.availability_service import AvailabilityService, block_cache, render_cache
+from app.services.timezone_backends import BACKENDS, get_zone_converter
+from app.services.timezone_engine import to_epoch
+
+RESULTS_DIR = Path(__file__).parent / "results"
+REPEAT = 5
+
+# Start of each date range: one in mid-summer, one just before New York falls back
+RANGES = {
+    "summer": datetime(2024, 6, 3, 13, 0, tzinfo=timezone.utc),
+    "dst": datetime(2024, 11, 2, 13, 0, tzinfo=timezone.utc),
+}
+GENERATOR_SLOT_COUNTS = [10, 1_000, 10_000]
+CHUNK_SLOT_COUNTS = [10, 1_000]
+GRANULARITIES = [5, 15, 60]
+ENDPOINT_SLOT_COUNTS = [10, 1_000]
+BACKEND_EPOCH_COUNT = 10_000
+
+
+class Case(NamedTuple):
+    name: str
+    params: Dict[str, object]
+    fn: Callable[[], object]
+
+
+def make_slot_dicts(count: int, range_name: str) -> List[dict]:
+    """Two-hour slots every three hours from the start of ``range_name``."""
+    base = RANGES[range_name]
+    slots = []
+    for i in range(count):
+        start = base + timedelta(hours=3 * i)
+        slots.append({
+            "start": start.isoformat(),
+            "end": (start + timedelta(hours=2)).isoformat(),
+        })
+    return slots
+
+
+def with_backend(backend: str, fn: Callable[[], object]) -> Callable[[], object]:
+    """Wrap ``fn`` to run with ``settings.TIMEZONE_BACKEND`` set to ``backend``."""
+    def run_with_backend():
+        previous = settings.TIMEZONE_BACKEND
+        settings.TIMEZONE_BACKEND = backend
+        try:
+            return fn()
+        finally:
+            settings.TIMEZONE_BACKEND = previous
+    return run_with_backend
+
+
+def iter_backend_cases() -> Iterator[Case]:
+    base = to_epoch(RANGES["dst"])
+    # Instants every 7 minutes across the New York fall-back transition
+    epochs = base + 420 * np.arange(BACKEND_EPOCH_COUNT, dtype=np.int64)
+    naive = [(RANGES["dst"] + timedelta(minutes=7 * i)).replace(tzinfo=None) for i in range(1_000)]
+    slots = [TimeSlot(**slot) for slot in make_slot_dicts(1_000, "dst")]
+    for backend in BACKENDS:
+        converter = get_zone_converter("America/New_York", backend)
+        yield Case(
+            f"timezone_backend[{backend}-to_local_array-{BACKEND_EPOCH_COUNT}]",
+            {"backend": backend, "instants": BACKEND_EPOCH_COUNT},
+            lambda converter=converter: converter.to_local_array(epochs),
+        )
+        yield Case(
+            f"timezone_backend[{backend}-localize-x1000]",
+            {"backend": backend, "calls": 1_000},
+            lambda converter=converter: [converter.localize(dt) for dt in naive],
+        )
+        yield Case(
+            f"timezone_backend[{backend}-chunks-1000-15m]",
+            {"backend": backend, "slots": 1_000, "granularity": 15},
+            with_backend(backend, lambda: AvailabilityService.generate_chunks_output(
+                slots, "America/New_York", "Europe/London", 15
+            )),
+        )
+
+
+def iter_cases() -> Iterator[Case]:
+    for range_name, base in RANGES.items():
+        naive = [(base + timedelta(minutes=7 * i)).replace(tzinfo=None) for i in range(1_000)]
+
+        def convert(naive=naive):
+            for dt in naive:
+                AvailabilityService.convert_timezone(dt, "America/New_York", "Asia/Kolkata")
+
+        yield Case(f"convert_timezone[x1000-{range_name}]", {"calls": 1_000, "range": range_name}, convert)
+
+    for range_name in RANGES:
+        for count in GENERATOR_SLOT_COUNTS:
+            slots = [TimeSlot(**slot) for slot in make_slot_dicts(count, range_name)]
+            yield Case(
+                f"generate_continuous_output[{count}-{range_name}]",
+                {"slots": count, "range": range_name},
+                lambda slots=slots: AvailabilityService.generate_continuous_output(
+                    slots, "America/New_York", "Europe/London"
+                ),
+            )
+        for count in CHUNK_SLOT_COUNTS:
+            slots = [TimeSlot(**slot) for slot in make_slot_dicts(count, range_name)]
+            for granularity in GRANULARITIES:
+                yield Case(
+                    f"generate_chunks_output[{count}-{granularity}m-{range_name}]",
+                    {"slots": count, "granularity": granularity, "range": range_name},
+                    lambda slots=slots, granularity=granularity: (
+                        AvailabilityService.generate_chunks_output(
+                            slots, "America/New_York", "Europe/London", granularity
+                        )
+                    ),
+                )
+
+    client = TestClient(app)
+    headers = {"Content-Type": "application/json", "X-API-Key": settings.API_KEY}
+    for output_format in ("continuous", "chunks"):
+        for count in ENDPOINT_SLOT_COUNTS:
+            payload = json.dumps({
+                "selected_slots": make_slot_dicts(count, "dst"),
+                "user_timezone": "America/New_York",
+                "recipient_timezone": "Asia/Tokyo",
+                "output_format": output_format,
+                "slot_granularity_minutes": 15,
+            })
+
+            def post(payload=payload):
+                client.post("/api/v1/availability/", content=payload, headers=headers).raise_for_status()
+
+            yield Case(
+                f"endpoint[{output_format}-{count}]",
+                {"format": output_format, "slots": count},
+                post,
+            )
+
+    yield from iter_backend_cases()
+
+
+def measure(fn: Callable[[], object], repeat: int) -> Dict[str, float]:
+    fn()  # warm up zone tables and label caches
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(args: argparse.Namespace) -> int:
+    logging.getLogger().setLevel(logging.WARNING)
+    render_cache.maxsize = 0
+    block_cache.maxsize = 0
+    commit = git_commit()
+    results = {}
+    for case in iter_cases():
+        if args.filter and args.filter not in case.name:
+            continue
+        stats = measure(case.fn, args.repeat)
+        results[case.name] = {"params": case.params, **stats}
+        print(f"{case.name:<50} {stats['median'] * 1000:>10.3f} ms")
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "meta": {
+            "commit": commit,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }, indent=2))
+    print(f"Wrote {output}")
+    return 0
+
+
+def compare(args: argparse.Namespace) -> int:
+    base = json.loads(Path(args.base).read_text())["results"]
+    head = json.loads(Path(args.head).read_text())["results"]
+    regressions = 0
+    print(f"{'benchmark':<50} {'base ms':>10} {'head ms':>10} {'ratio':>7}")
+    for name in sorted(base.keys() & head.keys()):
+        base_time = base[name]["median"]
+        head_time = head[name]["median"]
+        ratio = head_time / base_time
+        flag = ""
+        if ratio > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{name:<50} {base_time * 1000:>10.3f} {head_time * 1000:>10.3f} {ratio:>6.2f}x{flag}")
+    for name in sorted(base.keys() ^ head.keys()):
+        print(f"{name:<50} only in {'base' if name in base else 'head'}")
+    return 1 if regressions else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="Run the suite and write JSON results")
+    run_parser.add_argument("--output", help="Results file (default: benchmarks/results/<commit>.json)")
+    run_parser.add_argument("--filter", help="Only run benchmarks whose name contains this text")
+    run_parser.add_argument("--repeat", type=int, default=REPEAT, help="Timing repeats per benchmark")
+    run_parser.set_defaults(handler=run)
+    compare_parser = commands.add_parser("compare", help="Compare two results files")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("head")
+    compare_parser.add_argument("--threshold", type=float, default=1.10, help="Slowdown ratio reported as a regression")
+    compare_parser.set_defaults(handler=compare)
+    args = parser.parse_args()
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,13 @@
+import os
 import requests
 import json
 from datetime import datetime, timedelta
 import pytz
 
 # API Configuration
-BASE_URL = "https://timetext-1d1c.onrender.com/api/v1"
-API_KEY = "who-knows-if-this-is-going-to-work-!"
+# Point at a local server with e.g. TIMETEXT_BASE_URL=http://127.0.0.1:8000/api/v1
+BASE_URL = os.getenv("TIMETEXT_BASE_URL", "https://timetext-1d1c.onrender.com/api/v1")
+API_KEY = os.getenv("TIMETEXT_API_KEY", "who-knows-if-this-is-going-to-work-!")
 ENDPOINT = "/availability/"
 
 def test_api():